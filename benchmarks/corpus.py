@@ -0,0 +1,63 @@
+import random
+from typing import List
+
+# Corpus fixo em inglês: as mesmas sentenças e a mesma semente geram sempre os mesmos capítulos
+CORPUS_SENTENCES = [
+    "The sword trembled in his hand as the ancient seal began to crack.",
+    "\"You dare to challenge the Sect Master?\" the elder roared, his voice shaking the hall.",
+    "She smiled faintly and poured another cup of tea for her guest.",
+    "[System Notification: You have obtained 500 experience points.]",
+    "Level up! All attributes have increased by two points.",
+    "The rain had not stopped for three days, and the river was about to overflow its banks.",
+    "He had no memory of how he ended up in this strange world.",
+    "Lin Feng took a deep breath and stepped through the portal without hesitation.",
+    "\"Run!\" someone shouted, but it was already too late.",
+    "The merchant counted the silver coins twice before handing over the map.",
+    "A cold wind swept across the battlefield, carrying the smell of blood and smoke.",
+    "Her cultivation had finally reached the peak of the Foundation Establishment realm.",
+    "Nobody in the village believed the boy when he said he had seen a dragon.",
+    "They walked in silence until the lights of the city appeared on the horizon.",
+    "If you lose this duel, you will leave the academy and never return.",
+    "The beast let out a deafening howl and charged straight at the young hunter.",
+    "He opened the letter with trembling fingers, afraid of what he might read.",
+    "The princess looked out of the window, wondering whether he would keep his promise.",
+    "Within a single night, the entire mountain had been reduced to ashes.",
+    "The old librarian pushed his glasses up his nose and pointed at a dusty shelf in the corner.",
+    "Every disciple in the outer court knew that the trial would begin at dawn.",
+    "\"I don't need your pity,\" she said, turning away so that he would not see her tears.",
+    "The caravan stopped at the edge of the desert to wait for the sandstorm to pass.",
+    "Three figures appeared at the gate, their faces hidden beneath black hoods.",
+    "After a long pause, the king nodded and ordered the prisoners to be released.",
+    "The formation flickered once, twice, and then collapsed with a deafening roar.",
+    "He counted the remaining pills and realized they would last only another week.",
+    "Snow covered the rooftops of the capital, muffling the noise of the crowded streets.",
+    "The innkeeper glanced at the stranger's sword and decided not to ask any questions.",
+    "A faint golden light surrounded the baby as the midwife lifted him into the air.",
+    "Her opponent hesitated for a fraction of a second, and that was all she needed.",
+    "The ship creaked as the waves grew higher and the sky turned the color of ink.",
+    "\"This is the last time I will warn you,\" the captain said coldly.",
+    "Thousands of spirit stones glittered inside the hidden vault beneath the temple.",
+    "The children laughed as they chased each other through the blooming orchard.",
+    "He finally understood why his master had refused to teach him that technique.",
+    "The moon rose slowly above the lake, painting a silver path across the water.",
+    "Rumors about the missing heir spread through the empire faster than any messenger.",
+    "With a flick of her wrist, the talisman burst into flames and turned to ash.",
+    "The journey to the northern border would take at least twenty days on horseback.",
+]
+
+def sentences(count: int, seed: int = 0) -> List[str]:
+    """Retorna uma lista fixa de trechos distintos (sentenças do corpus ou pares delas), sem repetições."""
+    # O tradutor não traduz o mesmo trecho duas vezes, então repetições inflariam a vazão medida
+    pool = CORPUS_SENTENCES + [f"{first} {second}" for first in CORPUS_SENTENCES
+                               for second in CORPUS_SENTENCES if first != second]
+    if count > len(pool):
+        raise ValueError(f"O corpus tem apenas {len(pool)} trechos distintos")
+    return random.Random(seed).sample(pool, count)
+
+def chapter_text(number: int, paragraphs: int = 30) -> str:
+    """Gera o texto de um capítulo, um parágrafo por linha, sempre igual para o mesmo número."""
+    rng = random.Random(number)
+    return '\n'.join(
+        ' '.join(rng.choice(CORPUS_SENTENCES) for _ in range(rng.randint(2, 5)))
+        for _ in range(paragraphs)
+    )
@@ -0,0 +1,106 @@
+import hashlib
+import html
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from .corpus import chapter_text
+
+# XPaths da novel de teste, como seriam cadastrados no aplicativo
+CONTENT_XPATH = "//div[@class='chapter-content']"
+NEXT_CHAPTER_XPATH = "//a[contains(@class, 'next-chapter')]"
+INDEX_XPATH = "//ul[@class='chapter-list']//a"
+
+def chapter_page(number: int, chapters: int) -> str:
+    """Gera a página de um capítulo, com menus e scripts como num site real."""
+    paragraphs = ''.join(f"<p>{html.escape(line)}</p>\n" for line in chapter_text(number).splitlines())
+    next_link = (f'<a class="btn next-chapter" href="/novel/chapter-{number + 1}">Next Chapter</a>'
+                 if number < chapters else '<span class="btn next-chapter disabled">Next Chapter</span>')
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Fixture Novel - Chapter {number}</title>
+<script>window.dataLayer = window.dataLayer || [];</script></head>
+<body>
+<nav class="menu"><a href="/">Home</a> <a href="/novel/">Fixture Novel</a></nav>
+<h1>Chapter {number}</h1>
+<div class="chapter-content">
+{paragraphs}</div>
+<div class="chapter-nav"><a class="btn prev-chapter" href="/novel/chapter-{max(1, number - 1)}">Previous</a>
+{next_link}</div>
+<footer>Fixture site used by the benchmarks.</footer>
+</body></html>"""
+
+def index_page(chapters: int) -> str:
+    """Gera o índice da novel com links para todos os capítulos."""
+    items = ''.join(f'<li><a href="/novel/chapter-{n}">Chapter {n}</a></li>\n' for n in range(1, chapters + 1))
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Fixture Novel</title></head>
+<body><h1>Fixture Novel</h1><ul class="chapter-list">
+{items}</ul></body></html>"""
+
+class FixtureSite:
+    """Servidor HTTP local com uma novel de vários capítulos e links de próximo capítulo funcionando."""
+
+    def __init__(self, chapters: int = 50, host: str = '127.0.0.1', port: int = 0):
+        self.chapters = chapters
+        # Páginas geradas uma única vez, como se tivessem sido gravadas de um site real
+        self.pages = {f"/novel/chapter-{n}": chapter_page(n, chapters).encode('utf-8')
+                      for n in range(1, chapters + 1)}
+        self.pages['/novel/'] = index_page(chapters).encode('utf-8')
+        self.requests = 0
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Mantém as conexões abertas (keep-alive)
+
+            def do_GET(self):
+                site.requests += 1
+                body = site.pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sem registro a cada requisição
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def index_url(self) -> str:
+        return f"{self.base_url}/novel/"
+
+    def chapter_url(self, number: int) -> str:
+        return f"{self.base_url}/novel/chapter-{number}"
+
+    def start(self) -> 'FixtureSite':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'FixtureSite':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from .corpus import chapter_text, sentences
+from .fixture_site import FixtureSite, CONTENT_XPATH, NEXT_CHAPTER_XPATH, INDEX_XPATH
+
+# Cada etapa roda num processo próprio, para que o pico de memória medido seja só dela
+STAGES = ('scrape', 'translate', 'export')
+
+# Prefixo da linha com o resultado de uma etapa (o resto da saída são registros)
+RESULT_PREFIX = 'BENCHMARK_RESULT '
+
+# Variação a partir da qual a comparação com uma execução anterior aponta uma regressão
+REGRESSION_THRESHOLD = 0.10
+
+def _rss() -> Dict:
+    from src.novel_pt.resource_usage import current_rss_mb, peak_rss_mb
+    current = current_rss_mb()
+    peak = peak_rss_mb()
+    return {
+        'rss_mb': round(current, 1) if current is not None else None,
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+    }
+
+def bench_scrape(args) -> Dict:
+    """Mede páginas por segundo seguindo os links, pelo índice em paralelo e com o cache de páginas."""
+    from src.novel_pt.web_scraper import WebScraper
+    from src.novel_pt.rate_limiter import RateLimiter
+    from src.novel_pt.page_cache import PageCache
+
+    def follow_links(scraper: WebScraper, site: FixtureSite) -> int:
+        url = site.chapter_url(1)
+        pages = 0
+        while url and pages < site.chapters:
+            content = scraper.get_page(url)
+            if not content or not scraper.extract_text(content, CONTENT_XPATH):
+                raise RuntimeError(f"Falha ao extrair o capítulo {pages + 1}")
+            pages += 1
+            url = scraper.find_next_chapter_url(NEXT_CHAPTER_XPATH)
+        return pages
+
+    result = {}
+    with FixtureSite(args.chapters) as site, tempfile.TemporaryDirectory() as cache_dir:
+        # Seguindo os links de próximo capítulo, um por vez
+        scraper = WebScraper(RateLimiter(0))
+        start = time.perf_counter()
+        pages = follow_links(scraper, site)
+        elapsed = time.perf_counter() - start
+        result['linked_pages_per_second'] = round(pages / elapsed, 2)
+
+        # Pelo índice, com downloads em paralelo
+        start = time.perf_counter()
+        urls = scraper.get_chapter_urls(site.index_url, INDEX_XPATH)
+        with ThreadPoolExecutor(max_workers=args.download_workers) as executor:
+            texts = list(executor.map(lambda url: scraper.fetch_chapter_text(url, CONTENT_XPATH), urls))
+        elapsed = time.perf_counter() - start
+        if len(texts) != site.chapters or not all(texts):
+            raise RuntimeError("Falha ao baixar os capítulos pelo índice")
+        result['index_pages_per_second'] = round(len(texts) / elapsed, 2)
+        scraper.close()
+
+        # Com o cache de páginas preenchido (segunda execução)
+        cached_scraper = WebScraper(RateLimiter(0), page_cache=PageCache(Path(cache_dir)))
+        follow_links(cached_scraper, site)
+        start = time.perf_counter()
+        pages = follow_links(cached_scraper, site)
+        elapsed = time.perf_counter() - start
+        result['cached_pages_per_second'] = round(pages / elapsed, 2)
+        cached_scraper.close()
+
+        result['pages'] = site.chapters
+        result['requests'] = site.requests
+    return result
+
+def bench_translate(args) -> Dict:
+    """Mede segmentos e tokens por segundo do tradutor no corpus fixo, sem memória de tradução."""
+    from src.novel_pt.translator import Translator
+
+    corpus = sentences(args.sentences)
+    start = time.perf_counter()
+    translator = Translator(backend=args.backend, quantize=args.quantize)
+    load_seconds = time.perf_counter() - start
+
+    # Aquece o modelo antes de medir
+    translator.generate(corpus[:1])
+
+    # Conta apenas o que chega ao modelo (o tradutor descarta trechos repetidos)
+    generated = {'segments': 0, 'tokens': 0}
+    generate = translator.generate
+
+    def counting_generate(batch, token_ids=None):
+        generated['segments'] += len(batch)
+        generated['tokens'] += sum(len(ids) for ids in token_ids) if token_ids else \
+            sum(len(translator.tokenizer.tokenize(text)) for text in batch)
+        return generate(batch, token_ids)
+
+    translator.generate = counting_generate
+    start = time.perf_counter()
+    translator.translate_texts(corpus)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'backend': translator.backend.name,
+        'quantize': args.quantize,
+        'sentences': len(corpus),
+        'segments': generated['segments'],
+        'load_seconds': round(load_seconds, 3),
+        'segments_per_second': round(generated['segments'] / elapsed, 3),
+        'tokens_per_second': round(generated['tokens'] / elapsed, 2),
+    }
+
+def bench_export(args) -> Dict:
+    """Mede o tempo de gerar o arquivo final em cada formato e de acrescentar capítulos a ele."""
+    from src.novel_pt.exporters import EXPORTERS, create_exporter
+
+    texts = [chapter_text(n) for n in range(1, args.export_chapters + 1)]
+    result = {'chapters': len(texts)}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for output_format in EXPORTERS:
+            exporter = create_exporter(output_format, Path(output_dir), 'benchmark')
+            start = time.perf_counter()
+            exporter.open()
+            for number, text in enumerate(texts, 1):
+                exporter.add_chapter(number, text)
+            exporter.close()
+            elapsed = time.perf_counter() - start
+
+            # Acrescenta um lote de 10 capítulos ao arquivo existente
+            start = time.perf_counter()
+            exporter.open(append=True)
+            for number, text in enumerate(texts[:10], len(texts) + 1):
+                exporter.add_chapter(number, text)
+            exporter.close()
+            append_elapsed = time.perf_counter() - start
+
+            key = output_format.lower()
+            result[f'{key}_seconds'] = round(elapsed, 3)
+            result[f'{key}_chapters_per_second'] = round(len(texts) / elapsed, 1)
+            result[f'{key}_append_10_seconds'] = round(append_elapsed, 3)
+            result[f'{key}_size_mb'] = round(exporter.output_file.stat().st_size / 2 ** 20, 2)
+    return result
+
+BENCHMARKS = {
+    'scrape': bench_scrape,
+    'translate': bench_translate,
+    'export': bench_export,
+}
+
+def run_stage(stage: str, args) -> Dict:
+    """Executa uma etapa num processo separado e retorna o resultado (ou o erro)."""
+    command = [sys.executable, '-m', 'benchmarks.run', '--stage', stage, '--in-process'] + stage_arguments(args)
+    start = time.perf_counter()
+    process = subprocess.run(command, capture_output=True, text=True, cwd=str(Path(__file__).parent.parent))
+    for line in reversed(process.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    error = (process.stderr or process.stdout).strip().splitlines()
+    return {'error': error[-1] if error else f"código de saída {process.returncode}",
+            'wall_seconds': round(time.perf_counter() - start, 3)}
+
+def stage_arguments(args) -> List[str]:
+    arguments = [
+        '--chapters', str(args.chapters),
+        '--download-workers', str(args.download_workers),
+        '--sentences', str(args.sentences),
+        '--backend', args.backend,
+        '--export-chapters', str(args.export_chapters),
+    ]
+    if args.quantize:
+        arguments.append('--quantize')
+    return arguments
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Compara as métricas com uma execução anterior, apontando as regressões."""
+    lines = []
+    for stage, metrics in current['stages'].items():
+        previous = baseline.get('stages', {}).get(stage, {})
+        for name, value in metrics.items():
+            old = previous.get(name)
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old
+            # Vazão maior é melhor; tempo, tamanho e memória menores são melhores
+            higher_is_better = name.endswith('_per_second')
+            regression = -change > REGRESSION_THRESHOLD if higher_is_better else change > REGRESSION_THRESHOLD
+            marker = '⚠️ ' if regression else ''
+            lines.append(f"{marker}{stage}.{name}: {old} -> {value} ({change:+.1%})")
+    return lines
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmarks do download, da tradução e da exportação, sem rede externa.")
+    parser.add_argument('--stage', choices=STAGES, action='append',
+                        help="Etapa a executar (pode ser repetido; padrão: todas)")
+    parser.add_argument('--chapters', type=int, default=50, help="Capítulos da novel de teste")
+    parser.add_argument('--download-workers', type=int, default=4, help="Downloads simultâneos pelo índice")
+    parser.add_argument('--sentences', type=int, default=200, help="Trechos distintos do corpus traduzidos")
+    parser.add_argument('--backend', default='torch', help="Motor de tradução (torch ou ctranslate2)")
+    parser.add_argument('--quantize', action='store_true', help="Usa o modelo quantizado em int8")
+    parser.add_argument('--export-chapters', type=int, default=500, help="Capítulos do arquivo exportado")
+    parser.add_argument('--output', type=Path, help="Grava o resultado em JSON neste arquivo")
+    parser.add_argument('--compare', type=Path, help="Compara com o JSON de uma execução anterior")
+    parser.add_argument('--in-process', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Dentro do processo de uma etapa: executa e imprime o resultado
+    if args.in_process:
+        stage = args.stage[0]
+        start = time.perf_counter()
+        result = BENCHMARKS[stage](args)
+        result['wall_seconds'] = round(time.perf_counter() - start, 3)
+        result.update(_rss())
+        print(RESULT_PREFIX + json.dumps(result, ensure_ascii=False), flush=True)
+        return 0
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': {key: value for key, value in vars(args).items()
+                       if key not in ('stage', 'output', 'compare', 'in_process')},
+        'stages': {},
+    }
+    for stage in args.stage or STAGES:
+        print(f"Executando a etapa {stage}...", file=sys.stderr, flush=True)
+        report['stages'][stage] = run_stage(stage, args)
+
+    output = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output, encoding='utf-8')
+    print(output)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+
+    return 1 if any('error' in result for result in report['stages'].values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,9 @@ echo Instalando dependencias...
 pip install -r requirements.txt
 pip install pyinstaller
 
+echo Baixando dados do NLTK para distribuir com o executavel...
+python -m nltk.downloader -d src\novel_pt\nltk_data punkt punkt_tab
+
 echo Limpando builds anteriores...
 rmdir /s /q build
 rmdir /s /q dist
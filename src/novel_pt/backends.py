@@ -0,0 +1,197 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from .metrics import get_metrics
+from .profiling import model_profile_scope
+
+# Os motores importam suas dependências apenas quando são criados
+
+class TranslationBackend:
+    """Interface dos motores de inferência usados pelo Translator."""
+    name = ''
+
+    def __init__(self, model_name: str, tokenizer, max_length: int):
+        self.model_name = model_name
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def generate(self, batch: List[str], token_ids: Optional[List[List[int]]] = None) -> List[str]:
+        """Traduz um lote de segmentos (opcionalmente com os tokens já calculados, sem o de fim) e retorna as traduções na mesma ordem."""
+        raise NotImplementedError
+
+    def sequences(self, token_ids: List[List[int]]) -> List[List[int]]:
+        """Completa os tokens de cada segmento com o token de fim, respeitando o comprimento máximo."""
+        eos = self.tokenizer.eos_token_id
+        return [list(ids[:self.max_length - 1]) + [eos] for ids in token_ids]
+
+class TorchBackend(TranslationBackend):
+    """Motor padrão com o MarianMTModel do PyTorch, opcionalmente quantizado em int8."""
+    name = 'torch'
+
+    def __init__(self, model_name: str, tokenizer, max_length: int, quantize: bool = False,
+                 models_dir: Optional[Path] = None):
+        super().__init__(model_name, tokenizer, max_length)
+        import torch
+        from transformers import MarianMTModel
+
+        if quantize:
+            # A quantização dinâmica só é suportada em CPU
+            self.model = self.load_quantized(model_name, models_dir)
+            self.device = torch.device("cpu")
+        else:
+            self.model = MarianMTModel.from_pretrained(self.model_name)
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model.to(self.device)
+        self.model.eval()
+        self._lock = threading.Lock()  # O modelo é compartilhado entre threads
+
+    @staticmethod
+    def quantized_path(model_name: str, models_dir: Path) -> Path:
+        """Retorna o arquivo onde fica o modelo quantizado."""
+        return Path(models_dir) / 'torch-int8' / model_name.replace('/', '--') / 'model.pt'
+
+    @classmethod
+    def load_quantized(cls, model_name: str, models_dir: Optional[Path] = None):
+        """Carrega o modelo quantizado do cache ou quantiza as camadas lineares em int8 e salva o resultado."""
+        import torch
+        from transformers import MarianMTModel
+
+        path = cls.quantized_path(model_name, models_dir) if models_dir else None
+        if path and path.exists():
+            try:
+                return torch.load(str(path), map_location='cpu', weights_only=False)
+            except Exception as e:
+                print(f"⚠️ Erro ao carregar o modelo quantizado, quantizando novamente: {str(e)}")
+
+        print(f"Quantizando {model_name} em int8 (apenas na primeira execução)...")
+        model = MarianMTModel.from_pretrained(model_name)
+        model.eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        if path:
+            # Salva num arquivo temporário para não deixar um cache incompleto em caso de falha
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            torch.save(model, str(tmp_path))
+            tmp_path.replace(path)
+        return model
+
+    def encode(self, batch: List[str], token_ids: Optional[List[List[int]]] = None) -> Dict:
+        """Monta os tensores de entrada do modelo, tokenizando o lote apenas se os tokens não foram informados."""
+        import torch
+
+        if token_ids is None:
+            return self.tokenizer(batch, return_tensors="pt", padding=True, truncation=True, max_length=self.max_length).to(self.device)
+
+        sequences = self.sequences(token_ids)
+        width = max(len(sequence) for sequence in sequences)
+        pad = self.tokenizer.pad_token_id
+        input_ids = torch.tensor([sequence + [pad] * (width - len(sequence)) for sequence in sequences])
+        attention_mask = torch.tensor([[1] * len(sequence) + [0] * (width - len(sequence)) for sequence in sequences])
+        return {'input_ids': input_ids.to(self.device), 'attention_mask': attention_mask.to(self.device)}
+
+    def generate(self, batch: List[str], token_ids: Optional[List[List[int]]] = None) -> List[str]:
+        import torch
+
+        encoded = self.encode(batch, token_ids)
+        with self._lock, torch.inference_mode(), model_profile_scope():
+            start = time.perf_counter()
+            translated_tokens = self.model.generate(**encoded)
+            elapsed = time.perf_counter() - start
+        metrics = get_metrics()
+        metrics.observe('novel_pt_model_batch_seconds', elapsed, backend=self.name)
+        # Tokens gerados, sem contar o preenchimento dos segmentos mais curtos
+        metrics.inc('novel_pt_tokens_generated_total',
+                    int((translated_tokens != self.tokenizer.pad_token_id).sum()), backend=self.name)
+        return self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+
+class CTranslate2Backend(TranslationBackend):
+    """Motor otimizado para CPU com o CTranslate2, convertido uma única vez a partir do modelo Marian."""
+    name = 'ctranslate2'
+
+    def __init__(self, model_name: str, tokenizer, max_length: int, models_dir: Path, quantize: bool = False):
+        super().__init__(model_name, tokenizer, max_length)
+        import ctranslate2
+        from transformers import GenerationConfig
+
+        model_dir = self.convert(model_name, models_dir)
+        # O CTranslate2 quantiza os pesos em int8 ao carregar o modelo
+        self.translator = ctranslate2.Translator(
+            str(model_dir), device='cpu', compute_type='int8' if quantize else 'default'
+        )
+
+        # Usa os mesmos parâmetros de busca do modelo original
+        try:
+            self.beam_size = GenerationConfig.from_pretrained(model_name).num_beams or 1
+        except Exception:
+            self.beam_size = 4
+
+    @staticmethod
+    def model_dir(model_name: str, models_dir: Path) -> Path:
+        """Retorna a pasta onde fica o modelo convertido."""
+        return Path(models_dir) / 'ctranslate2' / model_name.replace('/', '--')
+
+    @classmethod
+    def convert(cls, model_name: str, models_dir: Path) -> Path:
+        """Converte o modelo para o formato do CTranslate2, se ainda não estiver em cache."""
+        model_dir = cls.model_dir(model_name, models_dir)
+        if (model_dir / 'model.bin').exists():
+            return model_dir
+
+        from ctranslate2.converters import TransformersConverter
+
+        print(f"Convertendo {model_name} para CTranslate2 (apenas na primeira execução)...")
+        # Converte numa pasta temporária para não deixar um cache incompleto em caso de falha
+        tmp_dir = model_dir.with_name(model_dir.name + '.tmp')
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.parent.mkdir(parents=True, exist_ok=True)
+        TransformersConverter(model_name).convert(str(tmp_dir), force=True)
+        if model_dir.exists():
+            shutil.rmtree(model_dir)
+        tmp_dir.rename(model_dir)
+        return model_dir
+
+    def generate(self, batch: List[str], token_ids: Optional[List[List[int]]] = None) -> List[str]:
+        if token_ids is None:
+            token_ids = [self.tokenizer.encode(text, truncation=True, max_length=self.max_length) for text in batch]
+        else:
+            token_ids = self.sequences(token_ids)
+        source = [self.tokenizer.convert_ids_to_tokens(ids) for ids in token_ids]
+        start = time.perf_counter()
+        with model_profile_scope('translate_batch'):
+            results = self.translator.translate_batch(
+                source, beam_size=self.beam_size, max_decoding_length=self.max_length
+            )
+        metrics = get_metrics()
+        metrics.observe('novel_pt_model_batch_seconds', time.perf_counter() - start, backend=self.name)
+        metrics.inc('novel_pt_tokens_generated_total',
+                    sum(len(result.hypotheses[0]) for result in results), backend=self.name)
+        return [
+            self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True
+            )
+            for result in results
+        ]
+
+BACKENDS = ('torch', 'ctranslate2')
+
+def create_backend(name: str, model_name: str, tokenizer, max_length: int,
+                   models_dir: Optional[Path] = None, quantize: bool = False) -> TranslationBackend:
+    """Cria o motor de inferência escolhido, voltando ao PyTorch se ele não estiver disponível."""
+    if name == 'ctranslate2':
+        if models_dir is None:
+            print("⚠️ Pasta de modelos não configurada, usando o motor PyTorch")
+        else:
+            try:
+                return CTranslate2Backend(model_name, tokenizer, max_length, models_dir, quantize)
+            except ImportError:
+                print("⚠️ ctranslate2 não está instalado, usando o motor PyTorch")
+            except Exception as e:
+                print(f"⚠️ Erro ao carregar o motor CTranslate2, usando o motor PyTorch: {str(e)}")
+    elif name != 'torch':
+        raise ValueError(f"Motor de tradução não suportado: {name}")
+    return TorchBackend(model_name, tokenizer, max_length, quantize, models_dir)
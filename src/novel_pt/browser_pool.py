@@ -0,0 +1,160 @@
+import atexit
+import json
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# selenium e webdriver_manager são importados apenas quando o primeiro navegador é iniciado
+
+def resolve_driver_path(cache_file: Optional[Path] = None, refresh: bool = False) -> str:
+    """Retorna o caminho do chromedriver, consultando o webdriver_manager apenas se não houver cache."""
+    if cache_file and cache_file.exists() and not refresh:
+        try:
+            path = json.loads(cache_file.read_text(encoding='utf-8'))['path']
+            if Path(path).exists():
+                return path
+        except (ValueError, KeyError, OSError):
+            pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    if cache_file:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps({'path': path, 'resolved_at': time.time()}), encoding='utf-8')
+        except OSError as e:
+            print(f"⚠️ Erro ao salvar o caminho do chromedriver: {str(e)}")
+    return path
+
+class BrowserPool:
+    """Conjunto de navegadores Chrome headless reaproveitados entre os trabalhos."""
+
+    def __init__(self, size: int = 1, driver_cache_file: Optional[Path] = None):
+        self.size = max(1, size)
+        self.driver_cache_file = driver_cache_file
+        self._idle: List = []
+        self._drivers: List = []  # Todos os navegadores iniciados, livres ou em uso
+        self._started = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _create_driver(self):
+        """Inicia um novo Chrome headless."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.add_argument('--headless')  # Executa em modo headless
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-infobars')
+        options.add_argument('--disable-notifications')
+        options.add_argument('--disable-popup-blocking')
+        options.add_argument('--start-maximized')
+
+        try:
+            service = Service(resolve_driver_path(self.driver_cache_file))
+            return webdriver.Chrome(options=options, service=service)
+        except Exception as e:
+            # O chromedriver em cache pode não servir mais (ex.: o Chrome foi atualizado)
+            print(f"⚠️ Erro ao iniciar o Chrome, resolvendo o chromedriver novamente: {str(e)}")
+            service = Service(resolve_driver_path(self.driver_cache_file, refresh=True))
+            return webdriver.Chrome(options=options, service=service)
+
+    def acquire(self):
+        """Retorna um navegador livre, iniciando um novo se o limite ainda não foi atingido."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("O conjunto de navegadores foi encerrado")
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                self._condition.wait()
+
+        # Inicia o navegador fora do lock, pois leva alguns segundos
+        try:
+            driver = self._create_driver()
+        except Exception:
+            with self._condition:
+                self._started -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._drivers.append(driver)
+        return driver
+
+    def release(self, driver) -> None:
+        """Limpa o estado do navegador (cookies, armazenamento, abas) e o devolve ao conjunto."""
+        try:
+            # Fecha abas extras e limpa os dados da página atual
+            for handle in driver.window_handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.get('about:blank')
+        except Exception as e:
+            # Navegador com problema: descarta em vez de reaproveitar
+            print(f"⚠️ Descartando navegador após erro ao limpar o estado: {str(e)}")
+            self._quit(driver)
+            with self._condition:
+                self._started -= 1
+                if driver in self._drivers:
+                    self._drivers.remove(driver)
+                self._condition.notify()
+            return
+
+        with self._condition:
+            if self._closed:
+                return
+            self._idle.append(driver)
+            self._condition.notify()
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def shutdown(self) -> None:
+        """Fecha todos os navegadores, inclusive os que ainda estão em uso."""
+        with self._condition:
+            self._closed = True
+            drivers, self._drivers, self._idle = self._drivers, [], []
+            self._condition.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+# Conjunto de navegadores compartilhado por todos os trabalhos do aplicativo
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def get_browser_pool(config: Optional['Config'] = None) -> BrowserPool:
+    """Retorna o conjunto de navegadores compartilhado, criando-o na primeira chamada."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                size=config.config['browser_pool_size'] if config else 1,
+                driver_cache_file=config.app_dir / 'chromedriver.json' if config else None
+            )
+            atexit.register(shutdown_browser_pool)
+        return _shared_pool
+
+def shutdown_browser_pool() -> None:
+    """Encerra o conjunto de navegadores compartilhado, se existir."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.shutdown()
+            _shared_pool = None
@@ -1,31 +1,66 @@
 import os
 import tempfile
 import shutil
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import Dict, Iterator, List, Optional, Callable, Tuple, Union
 from datetime import datetime
 from .web_scraper import WebScraper
-from .translator import Translator
-from docx import Document
+from .rate_limiter import get_rate_limiter
+from .browser_pool import get_browser_pool
+from .page_cache import PageCache
+from .job_store import JobStore
+from .exporters import create_exporter
+from .translator import get_shared_translator
+from .translation_pool import get_translation_pool
+from .metrics import get_metrics, metric_labels, write_metrics
+from .profiling import RunProfiler, create_run_profiler
 
 class ChapterManager:
-    def __init__(self, novel_data: Dict, progress_callback: Optional[Callable[[int, str], None]] = None, config: Optional['Config'] = None):
+    def __init__(self, novel_data: Dict, progress_callback: Optional[Callable[[int, str], None]] = None, config: Optional['Config'] = None,
+                 translation_gate: Optional['TranslationGate'] = None, job_id: Optional[str] = None):
         """Inicializa o gerenciador de capítulos."""
         self.novel_data = novel_data
-        self.scraper = WebScraper()
-        self.translator = Translator()
+        # As métricas de todas as etapas são separadas por novel
+        self.metrics = get_metrics()
+        self.metric_labels = {'novel_id': str(novel_data.get('id') or novel_data['name'])}
+        self.scraper = WebScraper(
+            get_rate_limiter(config) if config else None,
+            get_browser_pool(config),
+            PageCache(
+                config.app_dir / 'page_cache',
+                ttl_seconds=config.config['page_cache_ttl_hours'] * 3600,
+                max_bytes=config.config['page_cache_max_mb'] * 2 ** 20
+            ) if config else None,
+            metric_labels=self.metric_labels
+        )
+        # Com vários processos de tradução o modelo não é carregado neste processo
+        self.translation_pool = get_translation_pool(config)
+        self.translator = None if self.translation_pool else get_shared_translator(config)
         self.progress_callback = progress_callback or (lambda x, y: None)
         self.config = config
-
-        # Cria diretórios temporários
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="novel_pt_"))
-        self.raw_dir = self.temp_dir / "raw"
-        self.translated_dir = self.temp_dir / "translated"
-        self.raw_dir.mkdir()
-        self.translated_dir.mkdir()
+        self.next_chapter_url = None  # URL seguinte ao último capítulo baixado
+        # Com o agendador, a capacidade de tradução é dividida entre os trabalhos em execução
+        self.translation_gate = translation_gate
+        self.job_id = job_id or str(novel_data.get('id'))
+        self.profiler: Optional[RunProfiler] = None  # Ativo durante process_chapters no modo de perfilamento
+
+        # Os capítulos ficam num diretório persistente por novel, para retomar o lote após uma falha
+        if config:
+            self.temp_dir = None
+            job_dir = config.job_dir(novel_data.get('id') or novel_data['name'])
+        else:
+            self.temp_dir = Path(tempfile.mkdtemp(prefix="novel_pt_"))
+            job_dir = self.temp_dir
+        self.job_store = JobStore(job_dir)
+        self.raw_dir = self.job_store.raw_dir
+        self.translated_dir = self.job_store.translated_dir
 
         self.log("Iniciando processamento de capítulos...")
-        self.log(f"Diretório temporário: {self.temp_dir}")
+        self.log(f"Diretório de trabalho: {job_dir}")
 
     def log(self, message: str, progress: int = 0):
         """Registra uma mensagem e atualiza o progresso."""
@@ -35,181 +70,333 @@ class ChapterManager:
     def download_chapters(self, start_chapter: int, end_chapter: int) -> bool:
         """Baixa os capítulos da novel."""
         try:
-            current_chapter = start_chapter
-            total_chapters = end_chapter - start_chapter
-            current_url = self.novel_data['current_url']
+            total_chapters = end_chapter - start_chapter + 1
 
             self.log(f"Baixando {total_chapters} capítulos...")
             self.log(f"Capítulo inicial: {start_chapter}")
             self.log(f"Capítulo final: {end_chapter}")
 
-            while current_chapter <= end_chapter:
-                self.log(f"Baixando capítulo {current_chapter}...")
-                self.log(f"URL: {current_url}")
-
-                try:
-                    # Obtém o conteúdo da página
-                    content = self.scraper.get_page(current_url)
-                    if not content:
-                        self.log(f"❌ Falha ao obter conteúdo do capítulo {current_chapter}")
-                        return False
-
-                    # Extrai o texto do capítulo usando o xpath da novel
-                    text = self.scraper.extract_text(content, self.novel_data['content_xpath'])
-                    if not text:
-                        self.log(f"❌ Falha ao extrair texto do capítulo {current_chapter}")
-                        return False
-
-                    # Salva o capítulo
-                    chapter_file = self.raw_dir / f"chapter_{current_chapter}.txt"
-                    chapter_file.write_text(text, encoding='utf-8')
-                    self.log(f"✅ Capítulo {current_chapter} salvo em: {chapter_file}")
-
-                    # Atualiza o progresso
-                    progress = int((current_chapter - start_chapter) / total_chapters * 100)
-                    self.progress_callback(progress, f"Baixando capítulo {current_chapter}...")
-
-                    # Encontra a URL do próximo capítulo
-                    next_url = self.scraper.find_next_chapter_url(self.novel_data['next_chapter_xpath'])
-                    if next_url:
-                        self.log(f"Próximo capítulo encontrado: {next_url}")
-                        current_url = next_url  # Atualiza a URL para o próximo capítulo
-                    else:
-                        self.log("⚠️ Não foi possível encontrar o próximo capítulo")
-                        if current_chapter < end_chapter:
-                            self.log("❌ Não é possível continuar sem a URL do próximo capítulo")
-                            return False
-
-                    current_chapter += 1
-
-                except Exception as e:
-                    self.log(f"❌ Erro ao processar capítulo {current_chapter}: {str(e)}")
+            for current_chapter, text in self.iter_chapter_downloads(start_chapter, end_chapter):
+                if text is None:
                     return False
 
+                # Atualiza o progresso
+                progress = int((current_chapter - start_chapter + 1) / total_chapters * 100)
+                self.progress_callback(progress, f"Baixando capítulo {current_chapter}...")
+
             self.log("✅ Todos os capítulos foram baixados com sucesso!")
             return True
 
         except Exception as e:
             self.log(f"❌ Erro ao baixar capítulos: {str(e)}")
             return False
+        finally:
+            # A tradução não usa o navegador: libera-o para outros trabalhos
+            self.scraper.release_driver()
+
+    def iter_chapter_downloads(self, start_chapter: int, end_chapter: int) -> Iterator[Tuple[int, Optional[str]]]:
+        """Baixa os capítulos em ordem, produzindo (número, texto); o texto é None quando o download falha."""
+        # Com o XPath do índice, as URLs são conhecidas de antemão e baixadas em paralelo
+        if self.novel_data.get('index_xpath'):
+            urls = self.index_chapter_urls(end_chapter - start_chapter + 1)
+            if urls is not None:
+                yield from self.iter_index_downloads(start_chapter, end_chapter, urls)
+                return
+
+        # Sem índice, cada URL só é conhecida depois de carregar o capítulo anterior
+        current_url = self.novel_data['current_url']
+        for chapter_number in range(start_chapter, end_chapter + 1):
+            result = self.stored_chapter(chapter_number, current_url)
+            if result is not None:
+                self.next_chapter_url = result[1]
+            else:
+                result = self.download_chapter(chapter_number, current_url)
+            if result is None:
+                yield chapter_number, None
+                return
+            text, next_url = result
+            yield chapter_number, text
+
+            if next_url:
+                current_url = next_url  # Atualiza a URL para o próximo capítulo
+            elif chapter_number < end_chapter:
+                self.log("❌ Não é possível continuar sem a URL do próximo capítulo")
+                yield chapter_number + 1, None
+                return
+
+    def index_chapter_urls(self, count: int) -> Optional[List[str]]:
+        """Lê o índice da novel e retorna as URLs a partir do capítulo atual (até count + 1), ou None se não for possível."""
+        self.log("Lendo o índice de capítulos...")
+        urls = self.scraper.get_chapter_urls(self.novel_data['url'], self.novel_data['index_xpath'])
+        if not urls:
+            self.log("⚠️ Nenhum capítulo encontrado no índice, seguindo os links de próximo capítulo")
+            return None
+
+        # Localiza o capítulo atual na lista do índice
+        def normalize(url: str) -> str:
+            return url.split('#')[0].rstrip('/')
+
+        current_url = normalize(self.novel_data['current_url'])
+        positions = [i for i, url in enumerate(urls) if normalize(url) == current_url]
+        if not positions:
+            self.log("⚠️ URL atual não encontrada no índice, seguindo os links de próximo capítulo")
+            return None
+
+        # Muitos sites listam os capítulos do mais novo para o mais antigo: confirma a ordem pelo
+        # link de próximo capítulo da página atual
+        position = positions[0]
+        next_url = None
+        if self.scraper.get_page(urls[position]):
+            next_url = self.scraper.find_next_chapter_url(self.novel_data['next_chapter_xpath'])
+        next_url = normalize(next_url) if next_url else None
+        if next_url and position + 1 < len(urls) and normalize(urls[position + 1]) == next_url:
+            chapter_urls = urls[position:position + count + 1]
+        elif next_url and position > 0 and normalize(urls[position - 1]) == next_url:
+            self.log("Índice em ordem decrescente, invertendo")
+            chapter_urls = urls[position::-1][:count + 1]
+        else:
+            self.log("⚠️ Não foi possível confirmar a ordem do índice, seguindo os links de próximo capítulo")
+            return None
+
+        self.log(f"✅ Índice com {len(urls)} capítulos lido")
+        return chapter_urls
+
+    def iter_index_downloads(self, start_chapter: int, end_chapter: int, urls: List[str]) -> Iterator[Tuple[int, Optional[str]]]:
+        """Baixa em paralelo os capítulos de URLs conhecidas, produzindo-os em ordem."""
+        count = end_chapter - start_chapter + 1
+        workers = self.config.config['download_workers'] if self.config else 4
+        self.log(f"Baixando {min(count, len(urls))} capítulos com {workers} conexões...")
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Capítulos já baixados numa execução anterior não são buscados de novo
+            stored = [self.stored_chapter(start_chapter + offset, url) for offset, url in enumerate(urls[:count])]
+            fetch = self.profiled(self.scraper.fetch_chapter_text)
+            futures = [None if chapter else executor.submit(fetch, url, self.novel_data['content_xpath'])
+                       for chapter, url in zip(stored, urls[:count])]
+            for offset in range(count):
+                chapter_number = start_chapter + offset
+                if offset >= len(futures):
+                    self.log(f"❌ O índice não tem o capítulo {chapter_number}")
+                    yield chapter_number, None
+                    return
+
+                if stored[offset]:
+                    yield chapter_number, stored[offset][0]
+                    continue
+
+                text = futures[offset].result()
+                if not text:
+                    self.log(f"❌ Falha ao baixar o capítulo {chapter_number}: {urls[offset]}")
+                    yield chapter_number, None
+                    return
+
+                next_url = urls[offset + 1] if len(urls) > offset + 1 else None
+                self.save_raw_chapter(chapter_number, urls[offset], text, next_url)
+                yield chapter_number, text
+
+            self.next_chapter_url = urls[count] if len(urls) > count else None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stored_chapter(self, chapter_number: int, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Retorna o texto e a URL seguinte de um capítulo já baixado da mesma URL, ou None."""
+        chapter = self.job_store.chapter(chapter_number)
+        # Sem a URL seguinte registrada não é possível continuar a partir dele
+        if not chapter or chapter['url'] != url or not chapter.get('next_url'):
+            return None
+        try:
+            text = self.job_store.raw_text(chapter_number)
+        except OSError:
+            return None
+        self.log(f"♻️ Capítulo {chapter_number} já baixado, reaproveitando")
+        return text, chapter['next_url']
+
+    def save_raw_chapter(self, chapter_number: int, url: str, text: str, next_url: Optional[str] = None) -> Path:
+        """Salva o texto original de um capítulo e o registra no manifesto."""
+        chapter_file = self.job_store.mark_downloaded(chapter_number, url, text, next_url)
+        self.metrics.inc('novel_pt_chapters_total', stage='downloaded', **self.metric_labels)
+        self.log(f"✅ Capítulo {chapter_number} salvo em: {chapter_file}")
+        return chapter_file
+
+    def download_chapter(self, chapter_number: int, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Baixa e salva um capítulo, retornando o texto e a URL do próximo capítulo (ou None em caso de falha)."""
+        self.log(f"Baixando capítulo {chapter_number}...")
+        self.log(f"URL: {url}")
 
-    def translate_chapters(self) -> bool:
-        """Traduz os capítulos baixados."""
         try:
-            # Lista todos os arquivos de capítulos
-            chapter_files = list(self.raw_dir.glob("chapter_*.txt"))
-            total_chapters = len(chapter_files)
+            # Obtém o conteúdo da página
+            content = self.scraper.get_page(url)
+            if not content:
+                self.log(f"❌ Falha ao obter conteúdo do capítulo {chapter_number}")
+                return None
+
+            # Extrai o texto do capítulo usando o xpath da novel
+            text = self.scraper.extract_text(content, self.novel_data['content_xpath'])
+            if not text:
+                self.log(f"❌ Falha ao extrair texto do capítulo {chapter_number}")
+                return None
+
+            # Encontra a URL do próximo capítulo
+            next_url = self.scraper.find_next_chapter_url(self.novel_data['next_chapter_xpath'])
+            self.next_chapter_url = next_url
+
+            # Salva o capítulo
+            self.save_raw_chapter(chapter_number, url, text, next_url)
+            if next_url:
+                self.log(f"Próximo capítulo encontrado: {next_url}")
+            else:
+                self.log("⚠️ Não foi possível encontrar o próximo capítulo")
+            return text, next_url
 
-            if total_chapters == 0:
+        except Exception as e:
+            self.log(f"❌ Erro ao processar capítulo {chapter_number}: {str(e)}")
+            return None
+
+    def translate_chapters(self, start_chapter: Optional[int] = None, end_chapter: Optional[int] = None) -> bool:
+        """Traduz os capítulos baixados que ainda não foram traduzidos."""
+        try:
+            # Lista os capítulos baixados em ordem numérica
+            chapter_numbers = self.job_store.chapters(start_chapter, end_chapter, stage='downloaded')
+            if not chapter_numbers:
                 self.log("❌ Nenhum capítulo encontrado para traduzir")
                 return False
 
+            pending = [n for n in chapter_numbers if not self.job_store.has_stage(n, 'translated')]
+            if len(pending) < len(chapter_numbers):
+                self.log(f"♻️ {len(chapter_numbers) - len(pending)} capítulos já traduzidos, reaproveitando")
+            total_chapters = len(pending)
             self.log(f"Traduzindo {total_chapters} capítulos...")
 
+            # Lê os capítulos e, com vários processos, distribui as traduções entre eles
+            contents = [self.job_store.raw_text(n) for n in pending]
+            if self.translation_pool:
+                self.log(f"Usando {self.translation_pool.workers} processos de tradução")
+                futures = [self.translate_content(content) if content.strip() else None
+                           for content in contents]
+
             # Traduz cada capítulo
-            for i, chapter_file in enumerate(chapter_files, 1):
+            for i, (chapter_number, content) in enumerate(zip(pending, contents), 1):
                 try:
-                    self.log(f"Traduzindo capítulo {i}/{total_chapters}...")
+                    self.log(f"Traduzindo capítulo {chapter_number} ({i}/{total_chapters})...")
 
-                    # Lê o conteúdo do capítulo
-                    content = chapter_file.read_text(encoding='utf-8')
                     if not content.strip():
-                        self.log(f"⚠️ Capítulo {i} está vazio, pulando...")
+                        self.log(f"⚠️ Capítulo {chapter_number} está vazio, pulando...")
                         continue
 
-                    # Traduz o conteúdo
-                    translated_content = self.translator.translate_text(content)
+                    # Traduz o conteúdo (os resultados dos processos são lidos na ordem dos capítulos)
+                    if self.translation_pool:
+                        translated_content = futures[i - 1].result()
+                    else:
+                        translated_content = self.translate_content(content)
                     if not translated_content:
-                        self.log(f"❌ Falha ao traduzir capítulo {i}")
+                        self.log(f"❌ Falha ao traduzir capítulo {chapter_number}")
                         return False
 
                     # Salva o capítulo traduzido
-                    translated_file = self.translated_dir / f"chapter_{i}.txt"
-                    translated_file.write_text(translated_content, encoding='utf-8')
-                    self.log(f"✅ Capítulo {i} traduzido e salvo")
+                    self.job_store.mark_translated(chapter_number, translated_content)
+                    self.metrics.inc('novel_pt_chapters_total', stage='translated', **self.metric_labels)
+                    self.log(f"✅ Capítulo {chapter_number} traduzido e salvo")
 
                     # Atualiza o progresso
                     progress = int((i / total_chapters) * 100)
                     self.progress_callback(progress, f"Traduzindo capítulo {i}/{total_chapters}...")
 
                 except Exception as e:
-                    self.log(f"❌ Erro ao traduzir capítulo {i}: {str(e)}")
+                    self.log(f"❌ Erro ao traduzir capítulo {chapter_number}: {str(e)}")
                     return False
 
             self.log("✅ Todos os capítulos foram traduzidos com sucesso!")
+            if self.translator and self.translator.memory:
+                stats = self.translator.memory.stats()
+                self.log(f"Memória de tradução: {stats['hits']} acertos, {stats['misses']} falhas, "
+                         f"{stats['entries']} entradas")
             return True
 
         except Exception as e:
             self.log(f"❌ Erro ao traduzir capítulos: {str(e)}")
             return False
 
-    def merge_chapters(self) -> Optional[str]:
-        """Combina os capítulos traduzidos em um único arquivo."""
-        try:
-            # Lista todos os arquivos de capítulos traduzidos
-            chapter_files = sorted(self.translated_dir.glob("chapter_*.txt"))
-            if not chapter_files:
-                self.log("❌ Nenhum capítulo traduzido encontrado")
-                return None
+    def translate_content(self, content: str) -> Union[str, Future]:
+        """Traduz um capítulo, aguardando a vez do trabalho; com processos de tradução, retorna um Future."""
+        gate = self.translation_gate
+        if gate:
+            gate.acquire(self.job_id)
+
+        if not self.translation_pool:
+            try:
+                with metric_labels(**self.metric_labels), \
+                        self.metrics.timer('novel_pt_chapter_translation_seconds', **self.metric_labels):
+                    return self.translator.translate_text(content)
+            finally:
+                if gate:
+                    gate.release()
 
+        try:
+            # O Future recebe as etiquetas da novel para as métricas do processo de tradução
+            with metric_labels(**self.metric_labels):
+                future = self.translation_pool.submit(content)
+        except Exception:
+            if gate:
+                gate.release()
+            raise
+        if gate:
+            # A vaga é devolvida quando o processo termina o capítulo
+            future.add_done_callback(lambda _: gate.release())
+        return future
+
+    def merge_chapters(self, start_chapter: Optional[int] = None, end_chapter: Optional[int] = None) -> Optional[str]:
+        """Combina os capítulos traduzidos em um único arquivo, ou os acrescenta ao arquivo existente no modo append."""
+        try:
             # Cria o diretório de saída se não existir
             output_dir = Path(self.novel_data['output_dir'])
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Nome do arquivo de saída
-            novel_name = self.novel_data['name']
-            output_format = self.novel_data.get('format', 'DOCX')
-            output_file = output_dir / f"{novel_name}.{output_format.lower()}"
-
-            if output_format == 'DOCX':
-                # Cria um novo documento DOCX
-                doc = Document()
-
-                # Adiciona os capítulos ao documento
-                for i, chapter_file in enumerate(chapter_files, 1):
-                    try:
-                        # Lê o conteúdo do capítulo
-                        content = chapter_file.read_text(encoding='utf-8')
-
-                        # Adiciona o número do capítulo se necessário
-                        if self.novel_data.get('show_chapter_number', True):
-                            doc.add_paragraph(f"\nCapítulo {i}\n", style='Heading 1')
-                            doc.add_paragraph()  # Espaço após o título
-
-                        # Adiciona o conteúdo
-                        doc.add_paragraph(content)
-                        doc.add_paragraph()  # Espaço entre capítulos
-
-                        self.log(f"✅ Capítulo {i} adicionado ao arquivo final")
-
-                    except Exception as e:
-                        self.log(f"❌ Erro ao processar capítulo {i}: {str(e)}")
-                        return None
-
-                # Salva o documento
-                doc.save(str(output_file))
-            else:  # TXT
-                # Combina os capítulos em um arquivo TXT
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    for i, chapter_file in enumerate(chapter_files, 1):
-                        try:
-                            # Lê o conteúdo do capítulo
-                            content = chapter_file.read_text(encoding='utf-8')
-
-                            # Adiciona o número do capítulo se necessário
-                            if self.novel_data.get('show_chapter_number', True):
-                                f.write(f"\nCapítulo {i}\n\n")
-
-                            # Escreve o conteúdo
-                            f.write(content)
-                            f.write("\n\n")  # Espaço entre capítulos
-
-                            self.log(f"✅ Capítulo {i} adicionado ao arquivo final")
-
-                        except Exception as e:
-                            self.log(f"❌ Erro ao processar capítulo {i}: {str(e)}")
-                            return None
-
+            exporter = create_exporter(
+                self.novel_data.get('format', 'DOCX'),
+                output_dir,
+                self.novel_data['name'],
+                self.novel_data.get('show_chapter_number', True)
+            )
+            output_file = exporter.output_file
+            append_mode = self.novel_data.get('append_output', False)
+            append = append_mode and output_file.exists()
+
+            if append:
+                # Apenas os capítulos traduzidos que o arquivo ainda não contém
+                exported = set(self.job_store.exported_chapters(output_file))
+                chapter_numbers = [n for n in self.job_store.chapters(None, end_chapter, stage='translated')
+                                   if n not in exported]
+                if not chapter_numbers:
+                    self.log(f"✅ O arquivo final já contém todos os capítulos: {output_file}")
+                    return str(output_file)
+                self.log(f"Acrescentando {len(chapter_numbers)} capítulos ao arquivo existente...")
+            else:
+                # Lista os capítulos traduzidos em ordem numérica; no modo append, um arquivo novo recebe todos
+                chapter_numbers = self.job_store.chapters(None if append_mode else start_chapter, end_chapter,
+                                                          stage='translated')
+                if not chapter_numbers:
+                    self.log("❌ Nenhum capítulo traduzido encontrado")
+                    return None
+                self.job_store.reset_exports(output_file)
+
+            start = time.perf_counter()
+            exporter.open(append)
+            # Adiciona os capítulos ao arquivo
+            for i in chapter_numbers:
+                try:
+                    exporter.add_chapter(i, self.job_store.translated_text(i))
+                    self.log(f"✅ Capítulo {i} adicionado ao arquivo final")
+                except Exception as e:
+                    self.log(f"❌ Erro ao processar capítulo {i}: {str(e)}")
+                    exporter.abort()
+                    return None
+            exporter.close()
+            self.metrics.observe('novel_pt_export_seconds', time.perf_counter() - start,
+                                 format=exporter.extension, **self.metric_labels)
+            self.metrics.inc('novel_pt_chapters_total', len(chapter_numbers), stage='exported', **self.metric_labels)
+
+            self.job_store.mark_exported(chapter_numbers, output_file)
             self.log(f"✅ Arquivo final gerado com sucesso: {output_file}")
             return str(output_file)
 
@@ -217,18 +404,179 @@ class ChapterManager:
             self.log(f"❌ Erro ao gerar arquivo final: {str(e)}")
             return None
 
+    def pipeline_chapters(self, start_chapter: int, end_chapter: int) -> bool:
+        """Baixa e traduz os capítulos em paralelo, com filas limitadas entre as etapas."""
+        queue_size = self.config.config['pipeline_queue_size'] if self.config else 2
+        downloaded = queue.Queue(maxsize=queue_size)  # (número do capítulo, texto)
+        # Com processos de tradução, cada um pode ter um capítulo em andamento
+        workers = self.translation_pool.workers if self.translation_pool else 0
+        translated = queue.Queue(maxsize=queue_size + workers)  # (número do capítulo, tradução ou Future)
+        stop = threading.Event()
+        failures = []
+
+        self.log(f"Baixando e traduzindo {end_chapter - start_chapter + 1} capítulos em paralelo...")
+
+        def put(target: queue.Queue, item) -> bool:
+            """Coloca um item na fila, desistindo se outra etapa falhar."""
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def download_stage():
+            try:
+                for chapter_number, text in self.iter_chapter_downloads(start_chapter, end_chapter):
+                    if stop.is_set():
+                        return
+                    if text is None:
+                        failures.append("❌ Falha ao baixar os capítulos")
+                        stop.set()
+                        return
+                    if not put(downloaded, (chapter_number, text)):
+                        return
+            except Exception as e:
+                failures.append(f"❌ Erro ao baixar capítulos: {str(e)}")
+                stop.set()
+            finally:
+                put(downloaded, None)
+                # A tradução não usa o navegador: libera-o para outros trabalhos
+                self.scraper.release_driver()
+
+        def write_stage():
+            try:
+                while True:
+                    item = translated.get()
+                    if item is None:
+                        return
+                    chapter_number, result = item
+                    if result is None:
+                        # Já traduzido numa execução anterior
+                        continue
+                    # Os Futures dos processos de tradução são lidos na ordem dos capítulos
+                    translated_content = result.result() if isinstance(result, Future) else result
+                    if not translated_content:
+                        failures.append(f"❌ Falha ao traduzir capítulo {chapter_number}")
+                        stop.set()
+                        return
+                    self.job_store.mark_translated(chapter_number, translated_content)
+                    self.metrics.inc('novel_pt_chapters_total', stage='translated', **self.metric_labels)
+                    self.log(f"✅ Capítulo {chapter_number} traduzido e salvo")
+                    progress = int((chapter_number - start_chapter + 1) / (end_chapter - start_chapter + 1) * 100)
+                    self.progress_callback(progress, f"Capítulo {chapter_number} concluído")
+            except Exception as e:
+                failures.append(f"❌ Erro ao salvar capítulos traduzidos: {str(e)}")
+                stop.set()
+
+        downloader = threading.Thread(target=self.profiled(download_stage), daemon=True)
+        writer = threading.Thread(target=self.profiled(write_stage), daemon=True)
+        downloader.start()
+        writer.start()
+
+        # Traduz na thread atual enquanto os próximos capítulos são baixados
+        try:
+            while not stop.is_set():
+                try:
+                    item = downloaded.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                chapter_number, content = item
+                if self.job_store.has_stage(chapter_number, 'translated'):
+                    self.log(f"♻️ Capítulo {chapter_number} já traduzido, reaproveitando")
+                    if not put(translated, (chapter_number, None)):
+                        break
+                    continue
+                if not content.strip():
+                    self.log(f"⚠️ Capítulo {chapter_number} está vazio, pulando...")
+                    continue
+                self.log(f"Traduzindo capítulo {chapter_number}...")
+                result = self.translate_content(content)
+                if not put(translated, (chapter_number, result)):
+                    break
+        except Exception as e:
+            failures.append(f"❌ Erro ao traduzir capítulos: {str(e)}")
+            stop.set()
+        finally:
+            # Descarta o trabalho pendente em caso de falha e encerra a escrita
+            if stop.is_set():
+                for pending in (downloaded, translated):
+                    while not pending.empty():
+                        pending.get_nowait()
+            # A escrita pode ter falhado com a fila cheia: o aviso de fim nunca espera por ela
+            while writer.is_alive():
+                try:
+                    translated.put(None, timeout=0.5)
+                    break
+                except queue.Full:
+                    if stop.is_set():
+                        while not translated.empty():
+                            translated.get_nowait()
+            downloader.join()
+            writer.join()
+
+        for failure in failures:
+            self.log(failure)
+        if failures:
+            return False
+
+        self.log("✅ Todos os capítulos foram baixados e traduzidos com sucesso!")
+        return True
+
     def cleanup(self):
-        """Remove os arquivos temporários."""
+        """Devolve o navegador ao conjunto compartilhado e remove os arquivos temporários (o diretório da novel é mantido)."""
+        if hasattr(self, 'scraper'):
+            self.scraper.close()
         try:
-            if hasattr(self, 'temp_dir') and self.temp_dir.exists():
+            if getattr(self, 'temp_dir', None) and self.temp_dir.exists():
                 self.log("🧹 Limpando arquivos temporários...", 95)
                 shutil.rmtree(self.temp_dir)
                 self.log("✅ Arquivos temporários removidos com sucesso", 100)
         except Exception as e:
             self.log(f"⚠️ Erro ao limpar arquivos temporários: {str(e)}")
 
+    def log_metrics(self) -> None:
+        """Registra um resumo das métricas da novel e grava as métricas do processo na pasta do aplicativo."""
+        labels = self.metric_labels
+        fetches = self.metrics.total('novel_pt_page_fetch_seconds', **labels)
+        model_seconds = self.metrics.total('novel_pt_model_batch_seconds', **labels)
+        self.log(
+            f"📊 Páginas: {self.metrics.total('novel_pt_page_cache_misses_total', **labels):.0f} baixadas, "
+            f"{self.metrics.total('novel_pt_page_cache_hits_total', **labels):.0f} do cache ({fetches:.1f}s); "
+            f"segmentos: {self.metrics.total('novel_pt_sentences_translated_total', **labels):.0f} traduzidos, "
+            f"{self.metrics.total('novel_pt_translation_memory_hits_total', **labels):.0f} da memória; "
+            f"tokens: {self.metrics.total('novel_pt_tokens_generated_total', **labels):.0f} ({model_seconds:.1f}s de modelo); "
+            f"exportação: {self.metrics.total('novel_pt_export_seconds', **labels):.1f}s"
+        )
+        files = write_metrics(self.config)
+        if files:
+            self.log(f"📊 Métricas gravadas em: {files[0].parent}")
+
+    def profiled(self, func: Callable) -> Callable:
+        """Retorna a função perfilada quando ela roda em outra thread durante uma execução perfilada."""
+        return self.profiler.wrap(func) if self.profiler else func
+
     def process_chapters(self, start_chapter: int, batch_size: int = 1) -> Optional[str]:
-        """Processa os capítulos da novel."""
+        """Processa os capítulos da novel, perfilando a execução se o modo de perfilamento estiver ativo."""
+        self.profiler = create_run_profiler(self.config, self.metric_labels['novel_id'], self.log)
+        if self.profiler is None:
+            return self._process_chapters(start_chapter, batch_size)
+
+        self.log("📈 Modo de perfilamento ativo")
+        if self.translation_pool:
+            self.log("⚠️ A tradução roda em outros processos e não aparece no perfil")
+        try:
+            with self.profiler.run():
+                return self._process_chapters(start_chapter, batch_size)
+        finally:
+            self.profiler = None
+
+    def _process_chapters(self, start_chapter: int, batch_size: int) -> Optional[str]:
+        """Baixa, traduz e exporta um lote de capítulos."""
+        start = time.perf_counter()
         try:
             # Calcula o número total de capítulos a serem traduzidos
             current_chapter = start_chapter
@@ -240,35 +588,40 @@ class ChapterManager:
             self.log(f"Capítulo final: {end_chapter}")
             self.log(f"Tamanho do lote: {batch_size}")
 
-            # Baixa os capítulos
-            if not self.download_chapters(current_chapter, end_chapter):
-                self.log("❌ Falha ao baixar os capítulos")
-                return None
-
-            # Traduz os capítulos
-            if not self.translate_chapters():
-                self.log("❌ Falha ao traduzir os capítulos")
-                return None
+            if self.config and self.config.config['pipeline']:
+                # Baixa e traduz ao mesmo tempo
+                if not self.pipeline_chapters(current_chapter, end_chapter):
+                    self.log("❌ Falha ao baixar e traduzir os capítulos")
+                    return None
+            else:
+                # Baixa os capítulos
+                if not self.download_chapters(current_chapter, end_chapter):
+                    self.log("❌ Falha ao baixar os capítulos")
+                    return None
+
+                # Traduz os capítulos
+                if not self.translate_chapters(current_chapter, end_chapter):
+                    self.log("❌ Falha ao traduzir os capítulos")
+                    return None
 
             # Gera o arquivo final
-            output_file = self.merge_chapters()
+            output_file = self.merge_chapters(current_chapter, end_chapter)
             if not output_file:
                 self.log("❌ Falha ao gerar o arquivo final")
                 return None
 
             # Atualiza o capítulo atual e a URL apenas se todo o processo foi bem sucedido
-            if self.config:
-                # Obtém a URL do próximo capítulo
-                next_url = self.scraper.find_next_chapter_url(self.novel_data['next_chapter_xpath'])
-
-                # Cria uma cópia dos dados atuais da novel
-                update_data = self.novel_data.copy()
-
-                # Atualiza apenas os campos necessários
-                update_data.update({
+            if self.config and self.config.get_novel(self.novel_data['id']) is None:
+                self.log("⚠️ A novel foi removida durante o processamento, o capítulo atual não foi salvo")
+            elif self.config:
+                # URL do próximo capítulo encontrada ao baixar o último capítulo do lote
+                next_url = self.next_chapter_url
+
+                # Envia apenas os campos alterados: os demais podem ter sido editados durante o trabalho
+                update_data = {
                     'current_chapter': end_chapter + 1,
                     'current_url': next_url if next_url else self.novel_data['current_url']
-                })
+                }
 
                 self.config.update_novel(self.novel_data['id'], update_data)
                 self.log(f"✅ Capítulo atual atualizado para: {end_chapter + 1}")
@@ -277,11 +630,19 @@ class ChapterManager:
                 else:
                     self.log("⚠️ Não foi possível encontrar a URL do próximo capítulo")
 
+                # Os capítulos exportados não são mais necessários para retomar o lote
+                self.job_store.prune(end_chapter)
+
             return output_file
 
         except Exception as e:
             self.log(f"❌ Erro ao processar capítulos: {str(e)}")
             return None
+        finally:
+            # Devolve o navegador ao conjunto compartilhado para o próximo trabalho
+            self.scraper.close()
+            self.metrics.observe('novel_pt_batch_seconds', time.perf_counter() - start, **self.metric_labels)
+            self.log_metrics()
 
     def __del__(self):
         """Destrutor para garantir a limpeza dos recursos."""
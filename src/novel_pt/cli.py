@@ -0,0 +1,159 @@
+import argparse
+import json
+import multiprocessing
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from .config import Config
+from .scheduler import JobScheduler, Job, DONE, FAILED, CANCELLED
+from .translation_pool import shutdown_translation_pool
+from .browser_pool import shutdown_browser_pool
+
+# Execução em lote sem interface gráfica (servidores sem X): não importa o PyQt
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+def find_novels(config: Config, keys: List[str]) -> List[Dict]:
+    """Localiza as novels pelo ID ou pelo nome (sem diferenciar maiúsculas)."""
+    by_name = {novel.get('name', '').lower(): novel for novel in config.novels}
+    novels = []
+    for key in keys:
+        novel = config.get_novel(key) or by_name.get(key.lower())
+        if novel is None:
+            raise ValueError(f"Novel não encontrada: {key}")
+        novels.append(novel)
+    return novels
+
+class BatchRunner:
+    """Executa lotes de várias novels pelo agendador e relata o andamento no terminal."""
+
+    def __init__(self, config: Config, jobs: int, batches: int = 1, jsonl: bool = False, output=None):
+        self.config = config
+        self.batches = batches
+        self.jsonl = jsonl
+        self.output = output or sys.stdout
+        self.scheduler = JobScheduler(config, max_concurrent_jobs=jobs)
+        self.scheduler.add_listener(self.on_job_update)
+        self.remaining: Dict[str, int] = {}  # Lotes que faltam por novel
+        self.results: List[Job] = []
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict) -> None:
+        """Escreve um evento como uma linha JSON."""
+        with self._lock:
+            self.output.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self.output.flush()
+
+    def on_job_update(self, job: Job) -> None:
+        if self.jsonl:
+            self.emit(dict(job.to_dict(), event='job', time=time.time()))
+        elif job.finished:
+            detail = job.output_file if job.status == DONE else (job.error or '')
+            print(f"[{job.status}] {job.name}: {detail}", file=self.output, flush=True)
+
+        if not job.finished:
+            return
+        with self._lock:
+            self.results.append(job)
+            remaining = self.remaining.get(job.novel_id, 0)
+            # O próximo lote só é agendado depois que o anterior termina com sucesso
+            submit_next = job.status == DONE and remaining > 0
+            if submit_next:
+                self.remaining[job.novel_id] = remaining - 1
+        if submit_next:
+            novel = self.config.get_novel(job.novel_id)
+            if novel is not None:
+                self.scheduler.submit(novel)
+
+    def run(self, novels: List[Dict]) -> int:
+        """Processa as novels e retorna o código de saída."""
+        for novel in novels:
+            self.remaining[novel['id']] = self.batches - 1
+            self.scheduler.submit(novel)
+
+        try:
+            # Espera em intervalos curtos para atender ao Ctrl+C
+            while not self.scheduler.wait(timeout=0.5):
+                pass
+        except KeyboardInterrupt:
+            self.scheduler.shutdown()
+            return EXIT_INTERRUPTED
+
+        done = sum(1 for job in self.results if job.status == DONE)
+        failed = sum(1 for job in self.results if job.status == FAILED)
+        cancelled = sum(1 for job in self.results if job.status == CANCELLED)
+        if self.jsonl:
+            self.emit({'event': 'summary', 'done': done, 'failed': failed, 'cancelled': cancelled, 'time': time.time()})
+        else:
+            print(f"Concluídos: {done}, com erro: {failed}, cancelados: {cancelled}", file=self.output, flush=True)
+        return EXIT_OK if failed == 0 and cancelled == 0 else EXIT_FAILED
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Baixa e traduz novels em lote, sem interface gráfica.")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument('--novel', action='append', metavar='ID_OU_NOME',
+                           help="Novel a processar (pode ser repetido)")
+    selection.add_argument('--all', action='store_true', help="Processa todas as novels cadastradas")
+    selection.add_argument('--list', action='store_true', help="Lista as novels cadastradas e sai")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Novels processadas ao mesmo tempo (padrão: max_concurrent_jobs do config.json)")
+    parser.add_argument('--translation-workers', type=int, default=None,
+                        help="Processos de tradução (padrão: translation_workers do config.json)")
+    parser.add_argument('--batches', type=int, default=1,
+                        help="Lotes seguidos de cada novel (padrão: 1)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Perfila cada lote com o cProfile (resultados na pasta 'profiles' do aplicativo)")
+    parser.add_argument('--profile-torch', action='store_true',
+                        help="Com --profile, registra também o modelo com o torch.profiler")
+    parser.add_argument('--jsonl', action='store_true',
+                        help="Escreve o andamento como linhas JSON na saída padrão (registros vão para a saída de erro)")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    multiprocessing.freeze_support()
+    args = build_parser().parse_args(argv)
+    if args.batches < 1 or (args.jobs is not None and args.jobs < 1):
+        print("❌ --batches e --jobs devem ser maiores que zero", file=sys.stderr)
+        return EXIT_USAGE
+
+    config = Config()
+    if args.list:
+        for novel in config.novels:
+            print(f"{novel['id']}\t{novel.get('name', '')}\tcapítulo {novel.get('current_chapter', 1)}")
+        return EXIT_OK
+
+    try:
+        novels = config.novels if args.all else find_novels(config, args.novel)
+    except ValueError as e:
+        print(f"❌ {str(e)}", file=sys.stderr)
+        return EXIT_USAGE
+    if not novels:
+        print("⚠️ Nenhuma novel cadastrada", file=sys.stderr)
+        return EXIT_OK
+
+    if args.translation_workers is not None:
+        config.config['translation_workers'] = args.translation_workers  # Apenas nesta execução
+    if args.profile or args.profile_torch:
+        config.config['profiling'] = True
+        config.config['profile_torch'] = args.profile_torch
+
+    # No modo JSON a saída padrão fica só com os eventos; os registros do processamento vão para a saída de erro
+    output = sys.stdout
+    if args.jsonl:
+        sys.stdout = sys.stderr
+
+    try:
+        runner = BatchRunner(config, args.jobs or config.config['max_concurrent_jobs'],
+                             args.batches, args.jsonl, output)
+        return runner.run(list(novels))
+    finally:
+        sys.stdout = output
+        shutdown_translation_pool()
+        shutdown_browser_pool()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,35 @@
 import os
 import json
+import shutil
 import uuid
 from pathlib import Path
 from typing import Dict, List, Optional
+from .novel_store import NovelStore
 
 class Config:
+    # Valores padrão das configurações gerais, completados ao carregar o config.json
+    DEFAULTS = {
+        'output_dir': str(Path.home() / 'Documents' / 'Novels Traduzidas'),
+        'default_format': 'DOCX',
+        'default_batch_size': 5,
+        'show_chapter_number': True,
+        'translation_backend': 'torch',  # 'torch' ou 'ctranslate2'
+        'quantize': False,  # Modo int8 (menos memória e decodificação mais rápida em CPU)
+        'translation_workers': 1,  # Processos de tradução em paralelo (1 = no próprio processo)
+        'pipeline': True,  # Traduz um capítulo enquanto o próximo é baixado
+        'pipeline_queue_size': 2,  # Capítulos aguardando entre as etapas do pipeline
+        'requests_per_second': 0.5,  # Limite de requisições por site
+        'download_workers': 4,  # Downloads simultâneos quando a novel tem XPath do índice
+        'browser_pool_size': 1,  # Navegadores Chrome reaproveitados entre os trabalhos
+        'page_cache_ttl_hours': 168,  # Validade das páginas em cache antes de consultar o site
+        'page_cache_max_mb': 500,  # Tamanho máximo do cache de páginas
+        'max_concurrent_jobs': 2,  # Novels processadas ao mesmo tempo pelo agendador de trabalhos
+        'segment_max_tokens': 128,  # Tokens por segmento enviado ao modelo (sentenças de uma linha são agrupadas até esse limite)
+        'batch_max_tokens': 2048,  # Tokens por lote do modelo, contando o preenchimento dos segmentos mais curtos
+        'profiling': False,  # Perfila cada lote com o cProfile e grava o resultado na pasta 'profiles'
+        'profile_torch': False,  # No modo de perfilamento, registra também o modelo com o torch.profiler
+    }
+
     def __init__(self):
         # Define o diretório de dados do aplicativo
         if os.name == 'nt':  # Windows
@@ -17,10 +42,15 @@ class Config:
 
         # Arquivo de configuração
         self.config_file = self.app_dir / 'config.json'
-        self.novels_file = self.app_dir / 'novels.json'
+        self.novels_file = self.app_dir / 'novels.json'  # Formato antigo, migrado para o novels.db
+        self.novels_db_file = self.app_dir / 'novels.db'
+        self.translation_memory_file = self.app_dir / 'translation_memory.db'
+        self.models_dir = self.app_dir / 'models'
 
-        # Inicializa a lista de novels vazia
+        # Inicializa a lista de novels vazia e o índice por ID
         self.novels = []
+        self._novels_by_id: Dict[str, Dict] = {}
+        self.novel_store = NovelStore(self.novels_db_file)
 
         # Carrega as configurações
         self.config = self._load_config()
@@ -31,42 +61,50 @@ class Config:
         while True:
             new_id = str(uuid.uuid4())
             # Verifica se o ID já existe
-            if not any(novel.get('id') == new_id for novel in self.novels):
+            if new_id not in self._novels_by_id:
                 return new_id
 
     def _load_config(self) -> Dict:
         """Carrega as configurações gerais do aplicativo."""
+        config = dict(self.DEFAULTS)
         if self.config_file.exists():
             with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {
-            'output_dir': str(Path.home() / 'Documents' / 'Novels Traduzidas'),
-            'default_format': 'DOCX',
-            'default_batch_size': 5,
-            'show_chapter_number': True,
-        }
+                config.update(json.load(f))
+        return config
 
     def _load_novels(self) -> List[Dict]:
-        """Carrega a lista de novels salvas."""
-        if self.novels_file.exists():
-            with open(self.novels_file, 'r', encoding='utf-8') as f:
-                novels = json.load(f)
-                # Garante que todas as novels tenham um ID
-                for novel in novels:
-                    if 'id' not in novel:
-                        novel['id'] = self._generate_unique_id()
-                return novels
-        return []
+        """Carrega a lista de novels salvas, migrando o novels.json antigo na primeira execução."""
+        if self.novel_store.count() == 0 and self.novels_file.exists():
+            self._migrate_novels_file()
+
+        novels = self.novel_store.all()
+        self._novels_by_id = {novel['id']: novel for novel in novels}
+        return novels
+
+    def _migrate_novels_file(self) -> None:
+        """Importa as novels do novels.json para o banco numa única transação."""
+        with open(self.novels_file, 'r', encoding='utf-8') as f:
+            novels = json.load(f)
+        # Garante que todas as novels tenham um ID
+        for novel in novels:
+            if 'id' not in novel:
+                novel['id'] = self._generate_unique_id()
+            self._novels_by_id[novel['id']] = novel
+        self.novel_store.put_many(novels)
+        # Mantém uma cópia do arquivo antigo sem importá-lo de novo
+        os.replace(self.novels_file, self.novels_file.with_name('novels.json.bak'))
+        print(f"✅ {len(novels)} novels migradas para {self.novels_db_file}")
 
     def save_config(self) -> None:
-        """Salva as configurações gerais do aplicativo."""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
+        """Salva as configurações gerais do aplicativo de forma atômica."""
+        tmp_file = self.config_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(self.config, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_file, self.config_file)
 
     def save_novels(self) -> None:
-        """Salva a lista de novels."""
-        with open(self.novels_file, 'w', encoding='utf-8') as f:
-            json.dump(self.novels, f, indent=4, ensure_ascii=False)
+        """Salva a lista de novels numa única transação."""
+        self.novel_store.put_many(self.novels)
 
     def add_novel(self, novel_data: Dict) -> None:
         """Adiciona uma nova novel à lista."""
@@ -76,29 +114,26 @@ class Config:
         novel_data.setdefault('current_url', novel_data.get('url', ''))
 
         # Gera um ID único se não existir
-        if 'id' not in novel_data:
+        if not novel_data.get('id'):
             novel_data['id'] = self._generate_unique_id()
 
+        self.novel_store.put(novel_data)
         self.novels.append(novel_data)
-        self.save_novels()
+        self._novels_by_id[novel_data['id']] = novel_data
 
     def remove_novel(self, novel_id: str) -> bool:
         """Remove uma novel da configuração pelo ID."""
         try:
-            # Encontra o índice da novel
-            novel_index = -1
-            for i, novel in enumerate(self.novels):
-                if novel['id'] == novel_id:
-                    novel_index = i
-                    break
-
-            if novel_index == -1:
+            novel = self._novels_by_id.get(novel_id)
+            if novel is None:
                 print(f"❌ Novel com ID '{novel_id}' não encontrada")
                 return False
 
-            # Remove a novel
-            self.novels.pop(novel_index)
-            self.save_novels()
+            # Remove a novel e os capítulos guardados do seu trabalho
+            self.novel_store.delete(novel_id)
+            del self._novels_by_id[novel_id]
+            self.novels.remove(novel)
+            shutil.rmtree(self.job_dir(novel_id), ignore_errors=True)
             print(f"✅ Novel removida com sucesso")
             return True
 
@@ -108,26 +143,50 @@ class Config:
 
     def update_novel(self, novel_id: str, novel_data: Dict) -> None:
         """Atualiza os dados de uma novel existente pelo ID."""
-        # Encontra o índice da novel pelo ID
-        for i, novel in enumerate(self.novels):
-            if novel['id'] == novel_id:
-                # Preserva campos existentes que não estão no novel_data
-                current_novel = self.novels[i]
-                novel_data.setdefault('current_chapter', current_novel.get('current_chapter', 0))
-                novel_data.setdefault('status', current_novel.get('status', 'Pendente'))
-                novel_data.setdefault('last_url', current_novel.get('last_url', novel_data.get('url', '')))
-                novel_data.setdefault('id', novel_id)  # Mantém o ID original
-
-                self.novels[i] = novel_data
-                self.save_novels()
+        current_novel = self._novels_by_id.get(novel_id)
+        if current_novel is not None:
+            novel_data['id'] = novel_id  # Mantém o ID original
+
+            # Só os campos informados são alterados, sobre a versão gravada (que pode ter sido atualizada
+            # por outro processo); os demais campos gravados são preservados
+            stored = self.novel_store.update(novel_id, novel_data)
+            if stored is None:
+                # Novel removida por outro processo: não é recriada com dados parciais
+                self.novels.remove(current_novel)
+                del self._novels_by_id[novel_id]
                 return
+            # Atualiza o registro em memória no lugar, mantendo a ordem da lista
+            current_novel.clear()
+            current_novel.update(stored)
+            return
 
         # Se não encontrou a novel, adiciona como nova
         self.add_novel(novel_data)
 
+    def job_dir(self, novel_id: str) -> Path:
+        """Retorna o diretório com os capítulos do trabalho de uma novel."""
+        return self.app_dir / 'jobs' / str(novel_id)
+
     def get_novel(self, novel_id: str) -> Optional[Dict]:
         """Retorna os dados de uma novel pelo ID."""
-        for novel in self.novels:
-            if novel['id'] == novel_id:
-                return novel
-        return None
+        return self._novels_by_id.get(novel_id)
+
+    def refresh_novel(self, novel_id: str) -> Optional[Dict]:
+        """Relê uma novel do banco, incluindo alterações feitas por outros processos."""
+        stored = self.novel_store.get(novel_id)
+        current_novel = self._novels_by_id.get(novel_id)
+        if stored is None:
+            # Novel removida por outro processo
+            if current_novel is not None:
+                self.novels.remove(current_novel)
+                del self._novels_by_id[novel_id]
+            return None
+        if current_novel is None:
+            # Novel criada por outro processo
+            self.novels.append(stored)
+            self._novels_by_id[novel_id] = stored
+            return stored
+        # Atualiza o registro em memória no lugar, mantendo a ordem da lista
+        current_novel.clear()
+        current_novel.update(stored)
+        return current_novel
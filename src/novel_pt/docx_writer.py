@@ -0,0 +1,210 @@
+import os
+import re
+import shutil
+import zipfile
+from pathlib import Path
+from typing import List
+from xml.sax.saxutils import escape
+
+DOCUMENT_PART = 'word/document.xml'
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Estilos mínimos: texto normal e os títulos usados nos capítulos (mesmos IDs do python-docx)
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:sz w:val="24"/><w:lang w:val="pt-BR"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="160" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>'
+    '<w:next w:val="Normal"/><w:qFormat/><w:pPr><w:keepNext/><w:spacing w:before="480" w:after="240"/>'
+    '<w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:sz w:val="32"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/>'
+    '<w:next w:val="Normal"/><w:qFormat/><w:pPr><w:keepNext/><w:spacing w:before="240" w:after="120"/>'
+    '<w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>'
+    '</w:styles>'
+)
+
+DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><w:body>'
+)
+
+# Página A4 com margens de 2,5 cm
+DOCUMENT_TAIL = (
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" w:header="708" w:footer="708" w:gutter="0"/>'
+    '</w:sectPr></w:body></w:document>'
+)
+
+# Caracteres de controle que não são permitidos em XML
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+COPY_CHUNK_SIZE = 1024 * 1024
+FLUSH_SIZE = 64 * 1024
+
+def _xml_text(text: str) -> str:
+    return escape(INVALID_XML_CHARS.sub('', text))
+
+class DocxWriter:
+    """Gera um DOCX em fluxo, gravando o document.xml direto no zip, um parágrafo de cada vez."""
+
+    def __init__(self, path: Path, append: bool = False):
+        """Com append, o documento existente é copiado em fluxo e os novos parágrafos entram no final."""
+        self.path = Path(path)
+        self.append = append and self.path.exists()
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._zip = None
+        self._document = None
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._tail = DOCUMENT_TAIL.encode('utf-8')
+
+    def open(self) -> 'DocxWriter':
+        """Cria o arquivo temporário e grava tudo o que vem antes dos novos parágrafos."""
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        try:
+            if self.append:
+                self._copy_existing()
+            else:
+                self._zip.writestr('[Content_Types].xml', CONTENT_TYPES)
+                self._zip.writestr('_rels/.rels', PACKAGE_RELS)
+                self._zip.writestr('word/_rels/document.xml.rels', DOCUMENT_RELS)
+                self._zip.writestr('word/styles.xml', STYLES)
+                self._document = self._zip.open(DOCUMENT_PART, 'w', force_zip64=True)
+                self._document.write(DOCUMENT_HEAD.encode('utf-8'))
+        except Exception:
+            self.abort()
+            raise
+        return self
+
+    def _copy_existing(self) -> None:
+        """Copia as partes do documento existente e o corpo até o ponto onde os novos parágrafos entram."""
+        with zipfile.ZipFile(self.path) as source:
+            # O document.xml precisa ser a última parte, pois fica aberto para escrita
+            for info in source.infolist():
+                if info.filename == DOCUMENT_PART:
+                    continue
+                with source.open(info) as src, self._zip.open(info.filename, 'w', force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+            self._document = self._zip.open(DOCUMENT_PART, 'w', force_zip64=True)
+            # Copia em blocos, retendo o final para localizar as propriedades da seção e o fechamento do corpo
+            pending = b''
+            with source.open(DOCUMENT_PART) as src:
+                while True:
+                    chunk = src.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    pending += chunk
+                    if len(pending) > 2 * COPY_CHUNK_SIZE:
+                        self._document.write(pending[:-COPY_CHUNK_SIZE])
+                        pending = pending[-COPY_CHUNK_SIZE:]
+
+        # Os novos parágrafos entram antes do <w:sectPr> do corpo (se houver) ou do </w:body>
+        cut = pending.rfind(b'<w:sectPr')
+        if cut < max(pending.rfind(b'</w:p>'), pending.rfind(b'</w:tbl>')):
+            cut = pending.rfind(b'</w:body>')
+        if cut < 0:
+            raise ValueError(f"Documento DOCX inválido: {self.path}")
+        self._document.write(pending[:cut])
+        self._tail = pending[cut:]
+
+    def _write(self, xml: str) -> None:
+        self._buffer.append(xml)
+        self._buffered += len(xml)
+        if self._buffered >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._document.write(''.join(self._buffer).encode('utf-8'))
+            self._buffer = []
+            self._buffered = 0
+
+    def add_heading(self, text: str, level: int = 1) -> None:
+        """Adiciona um título."""
+        self._write(f'<w:p><w:pPr><w:pStyle w:val="Heading{level}"/></w:pPr>'
+                    f'<w:r><w:t xml:space="preserve">{_xml_text(text)}</w:t></w:r></w:p>')
+
+    def add_paragraph(self, text: str = '') -> None:
+        """Adiciona um parágrafo (vazio para espaçamento)."""
+        if text:
+            self._write(f'<w:p><w:r><w:t xml:space="preserve">{_xml_text(text)}</w:t></w:r></w:p>')
+        else:
+            self._write('<w:p/>')
+
+    def add_text(self, content: str) -> None:
+        """Adiciona um texto, com um parágrafo para cada linha não vazia."""
+        for line in content.splitlines():
+            line = line.strip()
+            if line:
+                self.add_paragraph(line)
+
+    def close(self) -> None:
+        """Fecha o corpo do documento e substitui o arquivo final."""
+        if self._zip is None:
+            return
+        self._flush()
+        self._document.write(self._tail)
+        self._document.close()
+        self._zip.close()
+        self._document = self._zip = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Descarta o arquivo temporário, mantendo o arquivo final como estava."""
+        try:
+            if self._document is not None:
+                self._document.close()
+            if self._zip is not None:
+                self._zip.close()
+        except Exception:
+            pass
+        self._document = self._zip = None
+        self._buffer = []
+        self._buffered = 0
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> 'DocxWriter':
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
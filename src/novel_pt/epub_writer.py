@@ -0,0 +1,198 @@
+import os
+import re
+import shutil
+import uuid
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+OPF_PART = 'OEBPS/content.opf'
+NAV_PART = 'OEBPS/nav.xhtml'
+NCX_PART = 'OEBPS/toc.ncx'
+# Partes geradas novamente ao fechar o livro
+INDEX_PARTS = (OPF_PART, NAV_PART, NCX_PART)
+
+CONTAINER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+    '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>'
+    '</container>'
+)
+
+STYLE = (
+    'body { font-family: serif; line-height: 1.5; margin: 0 5%; }\n'
+    'h1 { text-align: center; margin: 2em 0 1em; }\n'
+    'p { text-indent: 1.5em; margin: 0 0 0.6em; text-align: justify; }\n'
+)
+
+# Caracteres de controle que não são permitidos em XML
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+XHTML_NS = 'http://www.w3.org/1999/xhtml'
+OPF_NS = 'http://www.idpf.org/2007/opf'
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+
+def _xml_text(text: str) -> str:
+    return escape(INVALID_XML_CHARS.sub('', text))
+
+def _xhtml_head(title: str, language: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+        f'<html xmlns="{XHTML_NS}" xmlns:epub="http://www.idpf.org/2007/ops" '
+        f'lang="{language}" xml:lang="{language}">'
+        f'<head><meta charset="utf-8"/><title>{_xml_text(title)}</title>'
+        '<link rel="stylesheet" type="text/css" href="style.css"/></head>'
+    )
+
+class EpubWriter:
+    """Gera um EPUB 3 em fluxo: cada capítulo vira um XHTML gravado direto no zip; OPF e sumário são gerados ao fechar."""
+
+    def __init__(self, path: Path, title: str, language: str = 'pt-BR', append: bool = False):
+        """Com append, os capítulos do livro existente são copiados e os novos entram no final."""
+        self.path = Path(path)
+        self.title = title
+        self.language = language
+        self.append = append and self.path.exists()
+        self.identifier = f"urn:uuid:{uuid.uuid4()}"
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._zip = None
+        self._chapters: List[Tuple[str, str]] = []  # (arquivo, título), na ordem de leitura
+
+    def open(self) -> 'EpubWriter':
+        """Cria o arquivo temporário com a estrutura do livro (ou o conteúdo do livro existente)."""
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        try:
+            if self.append:
+                self._copy_existing()
+            else:
+                # O mimetype precisa ser a primeira entrada, sem compressão
+                self._zip.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+                self._zip.writestr('META-INF/container.xml', CONTAINER)
+                self._zip.writestr('OEBPS/style.css', STYLE)
+        except Exception:
+            self.abort()
+            raise
+        return self
+
+    def _copy_existing(self) -> None:
+        """Copia os capítulos do livro existente e lê a lista de capítulos do sumário."""
+        with zipfile.ZipFile(self.path) as source:
+            # Mantém o identificador do livro
+            package = ET.fromstring(source.read(OPF_PART))
+            identifier = package.find(f'.//{{{DC_NS}}}identifier')
+            if identifier is not None and identifier.text:
+                self.identifier = identifier.text
+
+            # Capítulos na ordem do sumário
+            nav = ET.fromstring(source.read(NAV_PART))
+            for link in nav.iter(f'{{{XHTML_NS}}}a'):
+                self._chapters.append((link.get('href'), ''.join(link.itertext())))
+
+            for info in source.infolist():
+                if info.filename in INDEX_PARTS:
+                    continue
+                if info.filename == 'mimetype':
+                    # Mantém o mimetype sem compressão e sem campos extras
+                    self._zip.writestr('mimetype', source.read(info), compress_type=zipfile.ZIP_STORED)
+                    continue
+                target = zipfile.ZipInfo(info.filename, info.date_time)
+                target.compress_type = info.compress_type
+                with source.open(info) as src, self._zip.open(target, 'w', force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+    def add_chapter(self, title: str, content: str, show_title: bool = True) -> None:
+        """Grava um capítulo, com um parágrafo para cada linha não vazia."""
+        href = f"chapter_{len(self._chapters) + 1:05d}.xhtml"
+        parts = [_xhtml_head(title, self.language), '<body><section epub:type="chapter">']
+        if show_title:
+            parts.append(f'<h1>{_xml_text(title)}</h1>')
+        for line in content.splitlines():
+            line = line.strip()
+            if line:
+                parts.append(f'<p>{_xml_text(line)}</p>')
+        parts.append('</section></body></html>')
+        self._zip.writestr(f"OEBPS/{href}", ''.join(parts))
+        self._chapters.append((href, title))
+
+    def _write_opf(self) -> None:
+        modified = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        with self._zip.open(OPF_PART, 'w', force_zip64=True) as f:
+            f.write((
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                f'<package xmlns="{OPF_NS}" version="3.0" unique-identifier="book-id">'
+                f'<metadata xmlns:dc="{DC_NS}">'
+                f'<dc:identifier id="book-id">{_xml_text(self.identifier)}</dc:identifier>'
+                f'<dc:title>{_xml_text(self.title)}</dc:title>'
+                f'<dc:language>{self.language}</dc:language>'
+                f'<meta property="dcterms:modified">{modified}</meta>'
+                '</metadata><manifest>'
+                '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+                '<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>'
+                '<item id="css" href="style.css" media-type="text/css"/>'
+            ).encode('utf-8'))
+            for i, (href, _) in enumerate(self._chapters, 1):
+                f.write(f'<item id="c{i}" href={quoteattr(href)} media-type="application/xhtml+xml"/>'.encode('utf-8'))
+            f.write(b'</manifest><spine toc="ncx">')
+            for i in range(1, len(self._chapters) + 1):
+                f.write(f'<itemref idref="c{i}"/>'.encode('utf-8'))
+            f.write(b'</spine></package>')
+
+    def _write_nav(self) -> None:
+        with self._zip.open(NAV_PART, 'w', force_zip64=True) as f:
+            f.write((_xhtml_head(self.title, self.language) +
+                     '<body><nav epub:type="toc" id="toc"><h1>Sumário</h1><ol>').encode('utf-8'))
+            for href, title in self._chapters:
+                f.write(f'<li><a href={quoteattr(href)}>{_xml_text(title)}</a></li>'.encode('utf-8'))
+            f.write(b'</ol></nav></body></html>')
+
+    def _write_ncx(self) -> None:
+        # Sumário no formato EPUB 2, usado por leitores mais antigos
+        with self._zip.open(NCX_PART, 'w', force_zip64=True) as f:
+            f.write((
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">'
+                f'<head><meta name="dtb:uid" content={quoteattr(self.identifier)}/></head>'
+                f'<docTitle><text>{_xml_text(self.title)}</text></docTitle><navMap>'
+            ).encode('utf-8'))
+            for i, (href, title) in enumerate(self._chapters, 1):
+                f.write((f'<navPoint id="p{i}" playOrder="{i}"><navLabel><text>{_xml_text(title)}</text></navLabel>'
+                         f'<content src={quoteattr(href)}/></navPoint>').encode('utf-8'))
+            f.write(b'</navMap></ncx>')
+
+    def close(self) -> None:
+        """Gera o OPF e os sumários e substitui o arquivo final."""
+        if self._zip is None:
+            return
+        self._write_opf()
+        self._write_nav()
+        self._write_ncx()
+        self._zip.close()
+        self._zip = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Descarta o arquivo temporário, mantendo o arquivo final como estava."""
+        try:
+            if self._zip is not None:
+                self._zip.close()
+        except Exception:
+            pass
+        self._zip = None
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> 'EpubWriter':
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,134 @@
+from pathlib import Path
+from .docx_writer import DocxWriter
+from .epub_writer import EpubWriter
+
+class Exporter:
+    """Escreve os capítulos traduzidos no arquivo final, do zero ou acrescentando a um arquivo existente."""
+
+    extension = ''
+
+    def __init__(self, output_file: Path, show_chapter_number: bool = True):
+        self.output_file = Path(output_file)
+        self.show_chapter_number = show_chapter_number
+
+    def open(self, append: bool = False) -> None:
+        """Prepara o arquivo; com append, os capítulos são acrescentados ao conteúdo existente."""
+        raise NotImplementedError
+
+    def add_chapter(self, number: int, content: str) -> None:
+        """Acrescenta um capítulo ao arquivo."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Conclui a escrita do arquivo."""
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        """Desfaz os capítulos escritos desde a abertura, mantendo o arquivo como estava."""
+        raise NotImplementedError
+
+class TxtExporter(Exporter):
+    """Arquivo TXT escrito em fluxo; no modo append, só os novos capítulos são gravados no final."""
+
+    extension = 'txt'
+
+    def __init__(self, output_file: Path, show_chapter_number: bool = True):
+        super().__init__(output_file, show_chapter_number)
+        self._file = None
+        self._start = 0  # Tamanho do arquivo antes dos novos capítulos
+
+    def open(self, append: bool = False) -> None:
+        self._file = open(self.output_file, 'a' if append else 'w', encoding='utf-8')
+        self._start = self._file.tell()
+
+    def add_chapter(self, number: int, content: str) -> None:
+        # Adiciona o número do capítulo se necessário
+        if self.show_chapter_number:
+            self._file.write(f"\nCapítulo {number}\n\n")
+
+        # Escreve o conteúdo
+        self._file.write(content)
+        self._file.write("\n\n")  # Espaço entre capítulos
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def abort(self) -> None:
+        if self._file:
+            self._file.truncate(self._start)
+        self.close()
+
+class DocxExporter(Exporter):
+    """Documento DOCX gerado em fluxo; no modo append, o documento existente é copiado e estendido."""
+
+    extension = 'docx'
+
+    def __init__(self, output_file: Path, show_chapter_number: bool = True):
+        super().__init__(output_file, show_chapter_number)
+        self._writer = None
+
+    def open(self, append: bool = False) -> None:
+        # O documento é gravado num arquivo temporário, então uma falha não deixa o arquivo pela metade
+        self._writer = DocxWriter(self.output_file, append).open()
+
+    def add_chapter(self, number: int, content: str) -> None:
+        # Adiciona o número do capítulo se necessário
+        if self.show_chapter_number:
+            self._writer.add_heading(f"Capítulo {number}")
+
+        # Adiciona o conteúdo, um parágrafo por linha
+        self._writer.add_text(content)
+        self._writer.add_paragraph()  # Espaço entre capítulos
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+class EpubExporter(Exporter):
+    """Livro EPUB gerado em fluxo, com um XHTML por capítulo; no modo append, os capítulos existentes são mantidos."""
+
+    extension = 'epub'
+
+    def __init__(self, output_file: Path, show_chapter_number: bool = True):
+        super().__init__(output_file, show_chapter_number)
+        self._writer = None
+
+    def open(self, append: bool = False) -> None:
+        self._writer = EpubWriter(self.output_file, self.output_file.stem, append=append).open()
+
+    def add_chapter(self, number: int, content: str) -> None:
+        # O título sempre aparece no sumário; no texto, apenas se o número do capítulo for exibido
+        self._writer.add_chapter(f"Capítulo {number}", content, show_title=self.show_chapter_number)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+EXPORTERS = {
+    'DOCX': DocxExporter,
+    'TXT': TxtExporter,
+    'EPUB': EpubExporter,
+}
+
+def create_exporter(output_format: str, output_dir: Path, novel_name: str,
+                    show_chapter_number: bool = True) -> Exporter:
+    """Cria o exportador do formato escolhido para o arquivo final da novel."""
+    exporter_class = EXPORTERS.get(output_format.upper())
+    if exporter_class is None:
+        raise ValueError(f"Formato não suportado: {output_format}")
+    output_file = Path(output_dir) / f"{novel_name}.{exporter_class.extension}"
+    return exporter_class(output_file, show_chapter_number)
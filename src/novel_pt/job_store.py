@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Etapas de um capítulo, na ordem em que são concluídas
+STAGES = ('downloaded', 'translated', 'exported')
+
+def content_hash(text: str) -> str:
+    """Calcula o hash do texto de um capítulo."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class JobStore:
+    """Armazena os capítulos de uma novel em disco com um manifesto da etapa de cada um, permitindo retomar lotes."""
+
+    def __init__(self, job_dir: Path):
+        self.job_dir = Path(job_dir)
+        self.raw_dir = self.job_dir / 'raw'
+        self.translated_dir = self.job_dir / 'translated'
+        self.manifest_file = self.job_dir / 'manifest.json'
+        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        self.translated_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.manifest = self._load()
+
+    def _load(self) -> Dict:
+        """Carrega o manifesto do disco, ou cria um vazio."""
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Manifesto inválido em {self.manifest_file}, recomeçando: {str(e)}")
+        return {'chapters': {}}
+
+    def save(self) -> None:
+        """Grava o manifesto de forma atômica."""
+        with self._lock:
+            tmp_file = self.manifest_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_file, self.manifest_file)
+
+    def chapter(self, number: int) -> Optional[Dict]:
+        """Retorna o registro de um capítulo no manifesto."""
+        with self._lock:
+            return self.manifest['chapters'].get(str(number))
+
+    def has_stage(self, number: int, stage: str) -> bool:
+        """Indica se o capítulo já concluiu a etapa informada."""
+        chapter = self.chapter(number)
+        return chapter is not None and STAGES.index(chapter['stage']) >= STAGES.index(stage)
+
+    def chapters(self, start: Optional[int] = None, end: Optional[int] = None, stage: Optional[str] = None) -> List[int]:
+        """Lista em ordem numérica os capítulos do intervalo que concluíram a etapa informada."""
+        with self._lock:
+            numbers = sorted(int(number) for number in self.manifest['chapters'])
+        return [
+            number for number in numbers
+            if (start is None or number >= start) and (end is None or number <= end)
+            and (stage is None or self.has_stage(number, stage))
+        ]
+
+    def raw_file(self, number: int) -> Path:
+        return self.raw_dir / f"chapter_{number}.txt"
+
+    def translated_file(self, number: int) -> Path:
+        return self.translated_dir / f"chapter_{number}.txt"
+
+    def raw_text(self, number: int) -> str:
+        return self.raw_file(number).read_text(encoding='utf-8')
+
+    def translated_text(self, number: int) -> str:
+        return self.translated_file(number).read_text(encoding='utf-8')
+
+    def mark_downloaded(self, number: int, url: str, text: str, next_url: Optional[str] = None) -> Path:
+        """Salva o texto original do capítulo; se o conteúdo mudou, a tradução anterior deixa de valer."""
+        path = self.raw_file(number)
+        path.write_text(text, encoding='utf-8')
+        digest = content_hash(text)
+        with self._lock:
+            chapter = self.manifest['chapters'].get(str(number), {})
+            stage = chapter.get('stage') if chapter.get('hash') == digest else 'downloaded'
+            self.manifest['chapters'][str(number)] = {
+                'number': number,
+                'url': url,
+                'next_url': next_url,
+                'hash': digest,
+                'stage': stage or 'downloaded',
+            }
+            self.save()
+        return path
+
+    def mark_translated(self, number: int, translated_text: str) -> Path:
+        """Salva a tradução do capítulo."""
+        path = self.translated_file(number)
+        path.write_text(translated_text, encoding='utf-8')
+        with self._lock:
+            chapter = self.manifest['chapters'][str(number)]
+            if not self.has_stage(number, 'translated'):
+                chapter['stage'] = 'translated'
+            self.save()
+        return path
+
+    def mark_exported(self, numbers: List[int], output_file: Optional[Path] = None) -> None:
+        """Marca os capítulos como incluídos no arquivo final e registra o conteúdo do arquivo."""
+        with self._lock:
+            for number in numbers:
+                self.manifest['chapters'][str(number)]['stage'] = 'exported'
+            if output_file is not None:
+                exported = self.manifest.setdefault('exports', {}).setdefault(str(Path(output_file).resolve()), [])
+                exported.extend(number for number in numbers if number not in exported)
+            self.save()
+
+    def exported_chapters(self, output_file: Path) -> List[int]:
+        """Lista os capítulos que o arquivo final já contém."""
+        with self._lock:
+            return list(self.manifest.get('exports', {}).get(str(Path(output_file).resolve()), []))
+
+    def prune(self, up_to: int) -> None:
+        """Remove os capítulos até up_to (já exportados); apaga o diretório se não sobrar nenhum capítulo."""
+        with self._lock:
+            chapters = self.manifest['chapters']
+            for number in [number for number in chapters if int(number) <= up_to]:
+                for path in (self.raw_file(int(number)), self.translated_file(int(number))):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                del chapters[number]
+            if not chapters:
+                shutil.rmtree(self.job_dir, ignore_errors=True)
+                self.manifest = {'chapters': {}}
+                return
+            for output_file, exported in self.manifest.get('exports', {}).items():
+                exported[:] = [number for number in exported if number > up_to]
+            self.save()
+
+    def reset_exports(self, output_file: Path) -> None:
+        """Esquece o conteúdo registrado de um arquivo final que será gerado do zero."""
+        with self._lock:
+            if self.manifest.get('exports', {}).pop(str(Path(output_file).resolve()), None) is not None:
+                self.save()
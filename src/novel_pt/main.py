@@ -1,4 +1,8 @@
 import sys
+import time
+import multiprocessing
+_IMPORT_START = time.perf_counter()  # Início da medição do tempo de abertura
+
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -10,46 +14,49 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem,
     QLabel,
     QMessageBox,
-    QProgressDialog,
+    QProgressBar,
     QHeaderView,
     QGridLayout,
-    QFrame
+    QFrame,
+    QCheckBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont
 from .config import Config
 from .novel_form import NovelForm
-from .chapter_manager import ChapterManager
+from .scheduler import JobScheduler, Job, QUEUED, DONE, FAILED
+from .translator import get_shared_translator
+from .translation_pool import get_translation_pool, shutdown_translation_pool
+from .browser_pool import shutdown_browser_pool
 from pathlib import Path
 
-class TranslationWorker(QThread):
-    """Worker para executar a tradução em uma thread separada."""
-    progress = pyqtSignal(int, str)  # Sinal para atualizar o progresso
-    finished = pyqtSignal(str)  # Sinal para indicar que terminou, com o caminho do arquivo
+# Tempo máximo (em segundos) entre o import do módulo e a exibição da janela principal
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Módulos pesados que não devem ser carregados antes da janela aparecer
+HEAVY_MODULES = ('torch', 'transformers', 'selenium', 'webdriver_manager')
+
+class JobSignals(QObject):
+    """Leva as atualizações dos trabalhos das threads do agendador para a thread da interface."""
+    job_updated = pyqtSignal(object)  # Job atualizado
+
+class TranslatorWarmupWorker(QThread):
+    """Worker que carrega o tradutor compartilhado em segundo plano."""
     error = pyqtSignal(str)  # Sinal para indicar erro
 
-    def __init__(self, novel_data: dict, config: 'Config'):
+    def __init__(self, config: 'Config'):
         super().__init__()
-        self.novel_data = novel_data
         self.config = config
-        self.chapter_manager = ChapterManager(novel_data, self.progress.emit, config)
 
     def run(self):
         try:
-            # Processa os capítulos
-            output_file = self.chapter_manager.process_chapters(
-                self.novel_data['current_chapter'],
-                self.novel_data['batch_size']
-            )
-
-            if output_file:
-                self.progress.emit(100, f"✅ Tradução concluída! Arquivo salvo em: {output_file}")
-                self.finished.emit(output_file)  # Emite o output_file junto com o sinal finished
+            pool = get_translation_pool(self.config)
+            if pool:
+                pool.warm_up()
             else:
-                self.error.emit("❌ Não foi possível processar os capítulos.")
-
+                get_shared_translator(self.config)
         except Exception as e:
-            self.error.emit(f"❌ Erro durante a tradução: {str(e)}")
+            self.error.emit(f"❌ Erro ao carregar o tradutor: {str(e)}")
 
 class NovelCard(QFrame):
     def __init__(self, novel_data, main_window, parent=None):
@@ -150,6 +157,13 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config = Config()
+
+        # Agendador de trabalhos; as atualizações chegam à interface por sinal
+        self.scheduler = JobScheduler(self.config)
+        self.job_signals = JobSignals()
+        self.job_signals.job_updated.connect(self.update_job_row)
+        self.scheduler.add_listener(self.job_signals.job_updated.emit)
+        self.job_rows = {}  # ID do trabalho -> linha da tabela
         self.setWindowTitle("Novel-PT - Tradutor de Novels")
         self.setMinimumSize(1200, 800)
 
@@ -191,9 +205,17 @@ class MainWindow(QMainWindow):
         add_button.clicked.connect(self.show_novel_form)
         layout.addWidget(add_button)
 
+        # Lista de trabalhos, atualizada sem bloquear a janela
+        self.setup_jobs_panel(layout)
+
         # Carrega novels salvas
         self.load_saved_novels()
 
+        # Carrega o modelo de tradução em segundo plano depois que a janela for exibida
+        self.warmup_thread = TranslatorWarmupWorker(self.config)
+        self.warmup_thread.error.connect(lambda message: print(message))
+        QTimer.singleShot(0, self.warmup_thread.start)
+
     def load_saved_novels(self):
         """Carrega as novels salvas e cria os cards."""
         # Limpa o grid existente
@@ -271,65 +293,128 @@ class MainWindow(QMainWindow):
             else:
                 QMessageBox.warning(self, "Erro", "Nome e URL são obrigatórios.")
 
-    def start_translation(self, novel_data):
-        """Inicia o processo de tradução."""
+    def setup_jobs_panel(self, layout):
+        """Cria a tabela de trabalhos e os botões da fila."""
+        jobs_header = QHBoxLayout()
+        jobs_title = QLabel("Trabalhos")
+        jobs_title.setFont(QFont('Arial', 14, QFont.Weight.Bold))
+        jobs_header.addWidget(jobs_title)
+        jobs_header.addStretch()
+
+        translate_all_button = QPushButton("Traduzir Todas")
+        translate_all_button.clicked.connect(self.start_all_translations)
+        jobs_header.addWidget(translate_all_button)
+
+        prioritize_button = QPushButton("Priorizar")
+        prioritize_button.clicked.connect(self.prioritize_selected_job)
+        jobs_header.addWidget(prioritize_button)
+
+        cancel_button = QPushButton("Cancelar")
+        cancel_button.clicked.connect(self.cancel_selected_job)
+        jobs_header.addWidget(cancel_button)
+
+        profile_checkbox = QCheckBox("Perfilar")
+        profile_checkbox.setToolTip("Perfila os próximos lotes e grava os resultados na pasta 'profiles'")
+        profile_checkbox.setChecked(self.config.config['profiling'])
+        profile_checkbox.toggled.connect(self.set_profiling)
+        jobs_header.addWidget(profile_checkbox)
+        layout.addLayout(jobs_header)
+
+        self.jobs_table = QTableWidget(0, 4)
+        self.jobs_table.setHorizontalHeaderLabels(["Novel", "Situação", "Progresso", "Mensagem"])
+        self.jobs_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.jobs_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.jobs_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setMaximumHeight(220)
+        layout.addWidget(self.jobs_table)
+
+    def set_profiling(self, enabled: bool):
+        """Ativa ou desativa o perfilamento dos próximos lotes."""
+        self.config.config['profiling'] = enabled
         try:
-            # Cria o diretório de saída se não existir
-            output_dir = Path('output')
-            output_dir.mkdir(exist_ok=True)
-
-            # Calcula o número total de capítulos a serem traduzidos
-            current_chapter = novel_data.get('current_chapter', 1)
-            end_chapter = novel_data.get('end_chapter', current_chapter)
-            total_chapters = end_chapter - current_chapter + 1
-
-            # Configura o progresso
-            self.progress_dialog = QProgressDialog(
-                "Baixando e traduzindo capítulos...",
-                "Cancelar",
-                0,
-                total_chapters,
-                self
-            )
-            self.progress_dialog.setWindowTitle("Progresso da Tradução")
-            self.progress_dialog.setWindowModality(Qt.WindowModality.ApplicationModal)
-            self.progress_dialog.setMinimumDuration(0)
-            self.progress_dialog.setAutoClose(False)
-            self.progress_dialog.setAutoReset(False)
-            self.progress_dialog.show()
-
-            # Cria e inicia a thread de tradução
-            self.translation_thread = TranslationWorker(novel_data, self.config)
-            self.translation_thread.progress.connect(self.update_progress)
-            self.translation_thread.finished.connect(self.translation_finished)
-            self.translation_thread.error.connect(self.translation_error)
-            self.translation_thread.start()
+            self.config.save_config()
+        except Exception as e:
+            print(f"Erro ao salvar configurações: {str(e)}")
 
+    def start_translation(self, novel_data, priority: int = 0):
+        """Coloca o próximo lote da novel na fila de trabalhos."""
+        try:
+            self.scheduler.submit(novel_data, priority)
         except Exception as e:
             QMessageBox.critical(self, 'Erro', f'Erro ao iniciar tradução: {str(e)}')
 
-    def update_progress(self, value, message):
-        """Atualiza a barra de progresso."""
-        self.progress_dialog.setValue(value)
-        self.progress_dialog.setLabelText(message)
-
-    def translation_finished(self, output_file):
-        """Processa o final da tradução."""
-        self.progress_dialog.close()
-        QMessageBox.information(
-            self,
-            'Tradução Concluída',
-            f'Tradução concluída com sucesso!\nArquivo salvo em: {output_file}'
-        )
-        self.load_saved_novels()  # Recarrega os cards para atualizar o capítulo atual
-
-    def translation_error(self, error_message):
-        """Processa erros durante a tradução."""
-        self.progress_dialog.close()
-        QMessageBox.critical(self, 'Erro', f'Erro durante a tradução: {error_message}')
+    def start_all_translations(self):
+        """Coloca todas as novels na fila, depois dos trabalhos pedidos individualmente."""
+        for novel_data in self.config.novels:
+            self.start_translation(novel_data, priority=1)
+
+    def selected_job_id(self):
+        """Retorna o ID do trabalho selecionado na tabela."""
+        row = self.jobs_table.currentRow()
+        if row < 0:
+            return None
+        return self.jobs_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+
+    def prioritize_selected_job(self):
+        """Passa o trabalho selecionado para a frente da fila."""
+        job_id = self.selected_job_id()
+        if job_id is None:
+            return
+        highest = min((job.priority for job in self.scheduler.jobs.values() if job.status == QUEUED), default=0)
+        if not self.scheduler.set_priority(job_id, highest - 1):
+            self.statusBar().showMessage("Apenas trabalhos na fila podem ser priorizados", 5000)
+
+    def cancel_selected_job(self):
+        """Cancela o trabalho selecionado, se ainda estiver na fila."""
+        job_id = self.selected_job_id()
+        if job_id is not None and not self.scheduler.cancel(job_id):
+            self.statusBar().showMessage("Apenas trabalhos na fila podem ser cancelados", 5000)
+
+    def update_job_row(self, job: Job):
+        """Atualiza a linha do trabalho na tabela."""
+        row = self.job_rows.get(job.id)
+        if row is None:
+            row = self.jobs_table.rowCount()
+            self.jobs_table.insertRow(row)
+            self.job_rows[job.id] = row
+            name_item = QTableWidgetItem(job.name)
+            name_item.setData(Qt.ItemDataRole.UserRole, job.id)
+            self.jobs_table.setItem(row, 0, name_item)
+            self.jobs_table.setCellWidget(row, 2, QProgressBar())
+
+        self.jobs_table.setItem(row, 1, QTableWidgetItem(job.status))
+        self.jobs_table.cellWidget(row, 2).setValue(job.progress)
+        message = job.error if job.status == FAILED else job.message
+        if job.status == DONE and job.output_file:
+            message = f"Arquivo salvo em: {job.output_file}"
+        self.jobs_table.setItem(row, 3, QTableWidgetItem(message or ''))
+
+        if job.status == DONE:
+            self.statusBar().showMessage(f"✅ {job.name}: tradução concluída", 10000)
+            self.load_saved_novels()  # Recarrega os cards para atualizar o capítulo atual
+        elif job.status == FAILED:
+            self.statusBar().showMessage(f"❌ {job.name}: {job.error}", 10000)
+
+def report_startup_time() -> float:
+    """Mede o tempo de abertura da janela e avisa se o orçamento foi excedido."""
+    elapsed = time.perf_counter() - _IMPORT_START
+    print(f"Janela principal aberta em {elapsed:.3f}s (orçamento: {STARTUP_BUDGET_SECONDS:.1f}s)")
+    if elapsed > STARTUP_BUDGET_SECONDS:
+        print(f"⚠️ Tempo de abertura acima do orçamento de {STARTUP_BUDGET_SECONDS:.1f}s")
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    if loaded:
+        print(f"⚠️ Módulos pesados carregados antes da janela: {', '.join(loaded)}")
+    return elapsed
 
 def init():
+    # Necessário para os processos de tradução no executável do PyInstaller
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
+    app.aboutToQuit.connect(window.scheduler.shutdown)
+    app.aboutToQuit.connect(shutdown_translation_pool)
+    app.aboutToQuit.connect(shutdown_browser_pool)
     window.show()
+    report_startup_time()
     sys.exit(app.exec())
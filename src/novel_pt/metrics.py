@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Limites (em segundos) dos intervalos dos histogramas de tempo
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Descrição de cada métrica, usada no arquivo do Prometheus
+METRICS_HELP = {
+    'novel_pt_page_fetch_seconds': "Tempo para obter uma página (source: http ou browser)",
+    'novel_pt_page_revalidations_total': "Páginas confirmadas pelo site sem novo download (resposta 304)",
+    'novel_pt_extraction_seconds': "Tempo para extrair o texto de um capítulo da página",
+    'novel_pt_page_cache_hits_total': "Páginas ou textos atendidos pelo cache de páginas",
+    'novel_pt_page_cache_misses_total': "Páginas que precisaram ser baixadas",
+    'novel_pt_sentences_translated_total': "Segmentos traduzidos pelo modelo",
+    'novel_pt_translation_memory_hits_total': "Segmentos atendidos pela memória de tradução",
+    'novel_pt_tokens_generated_total': "Tokens gerados pelo modelo",
+    'novel_pt_model_batch_seconds': "Tempo do modelo por lote de segmentos",
+    'novel_pt_chapter_translation_seconds': "Tempo para traduzir um capítulo",
+    'novel_pt_export_seconds': "Tempo para gerar o arquivo final de um lote",
+    'novel_pt_chapters_total': "Capítulos concluídos em cada etapa (stage)",
+    'novel_pt_batch_seconds': "Tempo total de um lote de capítulos",
+}
+
+_context = threading.local()
+
+def current_labels() -> Dict[str, str]:
+    """Retorna as etiquetas definidas para a thread atual com metric_labels."""
+    return dict(getattr(_context, 'labels', {}))
+
+@contextmanager
+def metric_labels(**labels) -> Iterator[None]:
+    """Acrescenta etiquetas (ex.: novel_id) às métricas registradas pela thread atual dentro do bloco."""
+    previous = getattr(_context, 'labels', {})
+    _context.labels = dict(previous, **{key: str(value) for key, value in labels.items()})
+    try:
+        yield
+    finally:
+        _context.labels = previous
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+class Metrics:
+    """Contadores e histogramas com etiquetas, exportáveis em JSON ou no formato de texto do Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: Dict[LabelKey, float] = {}
+        self._histograms: Dict[LabelKey, List] = {}  # [contagem por intervalo, soma, contagem]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict) -> LabelKey:
+        merged = dict(current_labels(), **{key: str(value) for key, value in labels.items()})
+        return name, tuple(sorted(merged.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Soma um valor ao contador."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Registra uma medida no histograma."""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[0][i] += 1
+                    break
+            histogram[1] += value
+            histogram[2] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Mede o tempo do bloco e o registra no histograma."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def total(self, name: str, **labels) -> float:
+        """Soma os contadores (ou a soma dos histogramas) do nome com as etiquetas informadas."""
+        wanted = {key: str(value) for key, value in labels.items()}
+        result = 0.0
+        with self._lock:
+            for (metric, key_labels), value in self._counters.items():
+                if metric == name and wanted.items() <= dict(key_labels).items():
+                    result += value
+            for (metric, key_labels), histogram in self._histograms.items():
+                if metric == name and wanted.items() <= dict(key_labels).items():
+                    result += histogram[1]
+        return result
+
+    def snapshot(self) -> Dict:
+        """Retorna todas as métricas num dicionário serializável em JSON."""
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'buckets': list(self.buckets),
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                'histograms': [
+                    {'name': name, 'labels': dict(labels), 'buckets': list(histogram[0]),
+                     'sum': histogram[1], 'count': histogram[2]}
+                    for (name, labels), histogram in sorted(self._histograms.items())
+                ],
+            }
+
+    def merge(self, snapshot: Dict, **labels) -> None:
+        """Soma as métricas de outro processo, acrescentando as etiquetas informadas."""
+        extra = {key: str(value) for key, value in labels.items()}
+        with self._lock:
+            for counter in snapshot.get('counters', []):
+                key = (counter['name'], tuple(sorted(dict(counter['labels'], **extra).items())))
+                self._counters[key] = self._counters.get(key, 0) + counter['value']
+            if tuple(snapshot.get('buckets', self.buckets)) != tuple(self.buckets):
+                return
+            for item in snapshot.get('histograms', []):
+                key = (item['name'], tuple(sorted(dict(item['labels'], **extra).items())))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+                histogram[0] = [a + b for a, b in zip(histogram[0], item['buckets'])]
+                histogram[1] += item['sum']
+                histogram[2] += item['count']
+
+    def reset(self) -> None:
+        """Descarta todas as métricas."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels: Dict[str, str]) -> str:
+        if not labels:
+            return ''
+        pairs = []
+        for key, value in sorted(labels.items()):
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{key}="{value}"')
+        return '{' + ','.join(pairs) + '}'
+
+    def to_prometheus(self) -> str:
+        """Formata as métricas no formato de texto do Prometheus."""
+        snapshot = self.snapshot()
+        lines = []
+        described = set()
+
+        def describe(name: str, kind: str) -> None:
+            if name not in described:
+                described.add(name)
+                if name in METRICS_HELP:
+                    lines.append(f"# HELP {name} {METRICS_HELP[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for counter in snapshot['counters']:
+            describe(counter['name'], 'counter')
+            lines.append(f"{counter['name']}{self._format_labels(counter['labels'])} {counter['value']}")
+
+        for item in snapshot['histograms']:
+            name = item['name']
+            describe(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(snapshot['buckets'], item['buckets']):
+                cumulative += count
+                labels = dict(item['labels'], le=repr(float(bound)))
+                lines.append(f"{name}_bucket{self._format_labels(labels)} {cumulative}")
+            labels = dict(item['labels'], le='+Inf')
+            lines.append(f"{name}_bucket{self._format_labels(labels)} {item['count']}")
+            lines.append(f"{name}_sum{self._format_labels(item['labels'])} {item['sum']}")
+            lines.append(f"{name}_count{self._format_labels(item['labels'])} {item['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: Path) -> Tuple[Path, Path]:
+        """Grava as métricas em metrics.prom e metrics.json na pasta informada, de forma atômica."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        prom_file = directory / 'metrics.prom'
+        json_file = directory / 'metrics.json'
+        for path, content in ((prom_file, self.to_prometheus()),
+                              (json_file, json.dumps(self.snapshot(), indent=4, ensure_ascii=False))):
+            tmp_file = path.with_name(f"{path.name}.tmp")
+            tmp_file.write_text(content, encoding='utf-8')
+            os.replace(tmp_file, path)
+        return prom_file, json_file
+
+# Métricas do processo, compartilhadas por todos os trabalhos
+_shared_metrics = None
+_shared_metrics_lock = threading.Lock()
+
+def get_metrics() -> Metrics:
+    """Retorna as métricas do processo, criando-as na primeira chamada."""
+    global _shared_metrics
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            _shared_metrics = Metrics()
+        return _shared_metrics
+
+def write_metrics(config: Optional['Config'] = None) -> Optional[Tuple[Path, Path]]:
+    """Grava as métricas do processo na pasta 'metrics' do aplicativo."""
+    if config is None:
+        return None
+    try:
+        return get_metrics().write(config.app_dir / 'metrics')
+    except OSError as e:
+        print(f"⚠️ Erro ao gravar as métricas: {str(e)}")
+        return None
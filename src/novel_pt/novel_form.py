@@ -58,9 +58,15 @@ class NovelForm(QDialog):
         self.next_chapter_xpath.setPlaceholderText("Ex: //a[contains(@class, 'next-chapter')]")
         form_layout.addRow("XPath do Próximo Capítulo:", self.next_chapter_xpath)
 
+        # XPath dos links do índice (opcional)
+        self.index_xpath = QLineEdit()
+        self.index_xpath.setText(self.novel_data.get('index_xpath', ''))
+        self.index_xpath.setPlaceholderText("Opcional. Ex: //ul[@class='chapter-list']//a")
+        form_layout.addRow("XPath do Índice:", self.index_xpath)
+
         # Formato de saída
         self.format_combo = QComboBox()
-        self.format_combo.addItems(["DOCX", "TXT"])
+        self.format_combo.addItems(["DOCX", "TXT", "EPUB"])
         self.format_combo.setCurrentText(self.novel_data.get('format', 'DOCX'))
         form_layout.addRow("Formato de Saída:", self.format_combo)
 
@@ -100,6 +106,11 @@ class NovelForm(QDialog):
         self.show_chapter_number.setChecked(self.novel_data.get('show_chapter_number', True))
         form_layout.addRow("Mostrar Número do Capítulo:", self.show_chapter_number)
 
+        # Acrescentar os novos capítulos ao arquivo existente em vez de gerar um arquivo por lote
+        self.append_output = QCheckBox()
+        self.append_output.setChecked(self.novel_data.get('append_output', False))
+        form_layout.addRow("Acrescentar ao Arquivo Existente:", self.append_output)
+
         layout.addLayout(form_layout)
 
         # Botões
@@ -132,11 +143,13 @@ class NovelForm(QDialog):
             'current_url': self.current_url.text().strip(),
             'content_xpath': self.content_xpath.text().strip(),
             'next_chapter_xpath': self.next_chapter_xpath.text().strip(),
+            'index_xpath': self.index_xpath.text().strip(),
             'format': self.format_combo.currentText(),
             'output_dir': self.output_input.text().strip(),
             'start_chapter': self.start_chapter.value(),
             'current_chapter': self.current_chapter.value(),
             'batch_size': self.batch_size.value(),
             'show_chapter_number': self.show_chapter_number.isChecked(),
+            'append_output': self.append_output.isChecked(),
             'status': self.novel_data.get('status', 'Pendente')
         }
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class NovelStore:
+    """Armazena as novels em SQLite, uma linha por novel indexada pelo ID, com atualizações atômicas."""
+
+    def __init__(self, db_path: Path):
+        """Abre (ou cria) o banco de novels."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # As transações são abertas explicitamente para travar o banco antes de ler e alterar uma novel
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL permite ler enquanto outro processo grava
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS novels ("
+            "id TEXT PRIMARY KEY, position INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+
+    def _transaction(self):
+        """Abre uma transação que trava o banco para escrita até o commit."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def all(self) -> List[Dict]:
+        """Retorna todas as novels na ordem em que foram adicionadas."""
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM novels ORDER BY position").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get(self, novel_id: str) -> Optional[Dict]:
+        """Retorna uma novel pelo ID."""
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM novels WHERE id = ?", (novel_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM novels").fetchone()[0]
+
+    def put_many(self, novels: List[Dict]) -> None:
+        """Grava as novels numa única transação, mantendo a posição das que já existem."""
+        with self._lock:
+            conn = self._transaction()
+            try:
+                for novel in novels:
+                    self._put(novel)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def put(self, novel: Dict) -> None:
+        """Grava uma novel, adicionando-a ao final se ainda não existir."""
+        self.put_many([novel])
+
+    def _put(self, novel: Dict) -> None:
+        data = json.dumps(novel, ensure_ascii=False)
+        cursor = self.conn.execute("UPDATE novels SET data = ? WHERE id = ?", (data, novel['id']))
+        if cursor.rowcount == 0:
+            self.conn.execute(
+                "INSERT INTO novels (id, position, data) "
+                "VALUES (?, (SELECT COALESCE(MAX(position), 0) + 1 FROM novels), ?)",
+                (novel['id'], data)
+            )
+
+    def update(self, novel_id: str, changes: Dict) -> Optional[Dict]:
+        """Aplica as alterações sobre os dados gravados de uma novel numa transação e retorna o resultado."""
+        with self._lock:
+            conn = self._transaction()
+            try:
+                row = conn.execute("SELECT data FROM novels WHERE id = ?", (novel_id,)).fetchone()
+                if row is None:
+                    conn.execute("ROLLBACK")
+                    return None
+                novel = json.loads(row[0])
+                novel.update(changes)
+                novel['id'] = novel_id
+                conn.execute("UPDATE novels SET data = ? WHERE id = ?",
+                             (json.dumps(novel, ensure_ascii=False), novel_id))
+                conn.execute("COMMIT")
+                return novel
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, novel_id: str) -> bool:
+        """Remove uma novel pelo ID."""
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM novels WHERE id = ?", (novel_id,))
+            return cursor.rowcount > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+class PageCache:
+    """Cache em disco das páginas baixadas e dos textos extraídos, com revalidação por ETag/Last-Modified."""
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float = 7 * 24 * 3600, max_bytes: int = 500 * 2 ** 20):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # Calculado na primeira escrita
+
+    def _path(self, url: str) -> Path:
+        """Retorna o arquivo da entrada de uma URL."""
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Retorna a entrada da URL (html, etag, last_modified, fetched_at, texts) ou None."""
+        path = self._path(url)
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        # Marca o acesso para a remoção das entradas menos usadas
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Indica se a entrada ainda pode ser usada sem consultar o site."""
+        return time.time() - entry.get('fetched_at', 0) < self.ttl_seconds
+
+    def get_fresh(self, url: str) -> Optional[Dict]:
+        """Retorna a entrada da URL se ela ainda estiver dentro do prazo de validade."""
+        entry = self.get(url)
+        if entry is not None and self.is_fresh(entry):
+            return entry
+        return None
+
+    def put(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Guarda a página baixada, descartando os textos extraídos da versão anterior."""
+        self._write(url, {
+            'url': url,
+            'html': html,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'texts': {},
+        })
+
+    def revalidated(self, url: str, entry: Dict) -> None:
+        """Renova o prazo de uma entrada confirmada pelo site (resposta 304)."""
+        entry['fetched_at'] = time.time()
+        self._write(url, entry)
+
+    def get_text(self, url: str, xpath: str) -> Optional[str]:
+        """Retorna o texto já extraído da página com o XPath, se a página estiver em cache e válida."""
+        entry = self.get(url)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return entry.get('texts', {}).get(xpath)
+
+    def put_text(self, url: str, xpath: str, text: str) -> None:
+        """Guarda o texto extraído da página em cache com o XPath."""
+        entry = self.get(url)
+        if entry is None:
+            return
+        entry.setdefault('texts', {})[xpath] = text
+        self._write(url, entry)
+
+    def _write(self, url: str, entry: Dict) -> None:
+        """Grava a entrada de forma atômica e remove as entradas antigas se o limite for excedido."""
+        path = self._path(url)
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Erro ao gravar a página em cache: {str(e)}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self.cache_dir.glob('*.json'))
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove as entradas sem acesso há mais que o prazo e, depois, as menos acessadas até ficar abaixo do limite."""
+        entries = []
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        # O alvo fica abaixo do limite para não limpar a cada nova página
+        target = self.max_bytes * 0.9
+        expired_before = time.time() - self.ttl_seconds
+        size = sum(entry[1] for entry in entries)
+        for mtime, file_size, path in entries:
+            if size <= target and mtime >= expired_before:
+                continue
+            try:
+                path.unlink()
+                size -= file_size
+            except OSError:
+                pass
+        self._size = size
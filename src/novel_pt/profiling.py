@@ -0,0 +1,142 @@
+import cProfile
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+# Funções mais pesadas listadas no log ao fim de cada execução perfilada
+TOP_FUNCTIONS = 15
+
+_context = threading.local()
+
+def model_profile_scope(name: str = 'model.generate'):
+    """Marca um trecho no torch.profiler quando a execução da thread atual está sendo perfilada."""
+    profiler = getattr(_context, 'run_profiler', None)
+    if profiler is None or profiler.torch_profiler is None:
+        return nullcontext()
+    import torch
+    return torch.profiler.record_function(name)
+
+class RunProfiler:
+    """Perfila uma execução com o cProfile em cada thread que ela usa e, opcionalmente, o modelo com o torch.profiler."""
+
+    def __init__(self, output_dir: Path, run_name: str, log: Callable[[str], None] = print,
+                 profile_torch: bool = False):
+        self.output_dir = Path(output_dir)
+        self.run_name = re.sub(r'[^\w.-]+', '_', run_name)
+        self.log = log
+        self.profile_torch = profile_torch
+        self.torch_profiler = None
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _start_profile(self) -> Optional[cProfile.Profile]:
+        """Ativa um cProfile na thread atual, se outro perfilador não estiver ativo."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # A partir do Python 3.12 só um perfilador pode estar ativo por vez
+            self.log(f"⚠️ Não foi possível perfilar esta thread: {str(e)}")
+            return None
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def wrap(self, func: Callable) -> Callable:
+        """Retorna a função perfilada, para ser executada em outra thread da mesma execução."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            previous = getattr(_context, 'run_profiler', None)
+            _context.run_profiler = self
+            profile = self._start_profile()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profile:
+                    profile.disable()
+                _context.run_profiler = previous
+        return wrapper
+
+    def _start_torch(self) -> None:
+        try:
+            import torch
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            self.torch_profiler = torch.profiler.profile(activities=activities)
+            self.torch_profiler.__enter__()
+        except Exception as e:
+            self.torch_profiler = None
+            self.log(f"⚠️ Erro ao iniciar o torch.profiler: {str(e)}")
+
+    def _stop_torch(self, trace_file: Path) -> None:
+        profiler, self.torch_profiler = self.torch_profiler, None
+        try:
+            profiler.__exit__(None, None, None)
+            profiler.export_chrome_trace(str(trace_file))
+            self.log(f"📈 Trace do modelo gravado em: {trace_file}")
+            table = profiler.key_averages().table(sort_by='self_cpu_time_total', row_limit=TOP_FUNCTIONS)
+            self.log(f"Operações mais pesadas do modelo:\n{table}")
+        except Exception as e:
+            self.log(f"⚠️ Erro ao gravar o trace do modelo: {str(e)}")
+
+    @contextmanager
+    def run(self) -> Iterator['RunProfiler']:
+        """Perfila a thread atual durante o bloco e grava os resultados ao final."""
+        previous = getattr(_context, 'run_profiler', None)
+        _context.run_profiler = self
+        if self.profile_torch:
+            self._start_torch()
+        profile = self._start_profile()
+        try:
+            yield self
+        finally:
+            if profile:
+                profile.disable()
+            _context.run_profiler = previous
+            self.save()
+
+    def save(self) -> Optional[Path]:
+        """Grava o pstats (e o trace do modelo) da execução e registra as funções mais pesadas."""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            base = self.output_dir / f"{time.strftime('%Y%m%d_%H%M%S')}_{self.run_name}"
+            if self.torch_profiler is not None:
+                self._stop_torch(base.with_name(base.name + '.trace.json'))
+
+            with self._lock:
+                profiles = list(self._profiles)
+            if not profiles:
+                return None
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats_file = base.with_name(base.name + '.pstats')
+            stats.dump_stats(str(stats_file))
+            self.log(f"📈 Perfil gravado em: {stats_file} ({len(profiles)} threads)")
+            self.log_summary(stats)
+            return stats_file
+        except Exception as e:
+            self.log(f"⚠️ Erro ao gravar o perfil: {str(e)}")
+            return None
+
+    def log_summary(self, stats: pstats.Stats) -> None:
+        """Registra as funções com maior tempo próprio."""
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:TOP_FUNCTIONS]
+        lines = [f"Funções mais pesadas (tempo próprio / acumulado / chamadas), total {stats.total_tt:.2f}s:"]
+        for (filename, line, function), (_, calls, own_time, cumulative_time, _) in rows:
+            location = f"{Path(filename).name}:{line}({function})" if line else function
+            lines.append(f"  {own_time:8.3f}s {cumulative_time:8.3f}s {calls:8d}  {location}")
+        self.log('\n'.join(lines))
+
+def create_run_profiler(config: Optional['Config'], run_name: str,
+                        log: Callable[[str], None] = print) -> Optional[RunProfiler]:
+    """Cria o perfilador de uma execução se o modo de perfilamento estiver ativo na configuração."""
+    if config is None or not config.config['profiling']:
+        return None
+    return RunProfiler(config.app_dir / 'profiles', run_name, log, config.config['profile_torch'])
@@ -0,0 +1,165 @@
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+from .config import Config
+from .resource_usage import current_rss_mb
+from .translator import Translator
+
+# Prefixo da linha com o resultado da medição feita no processo auxiliar
+RESULT_PREFIX = 'QUALITY_RESULT '
+
+# Amostra fixa usada para comparar o modelo fp32 com o modelo quantizado
+SAMPLE_SENTENCES = [
+    "The sword trembled in his hand as the ancient seal began to crack.",
+    "\"You dare to challenge the Sect Master?\" the elder roared, his voice shaking the hall.",
+    "She smiled faintly and poured another cup of tea for her guest.",
+    "[System Notification: You have obtained 500 experience points.]",
+    "Level up! All attributes have increased by two points.",
+    "The rain had not stopped for three days, and the river was about to overflow its banks.",
+    "He had no memory of how he ended up in this strange world.",
+    "Author's note: Thank you all for your support, the next chapter will be released on Friday.",
+    "Lin Feng took a deep breath and stepped through the portal without hesitation.",
+    "\"Run!\" someone shouted, but it was already too late.",
+    "The merchant counted the silver coins twice before handing over the map.",
+    "A cold wind swept across the battlefield, carrying the smell of blood and smoke.",
+    "Her cultivation had finally reached the peak of the Foundation Establishment realm.",
+    "Nobody in the village believed the boy when he said he had seen a dragon.",
+    "They walked in silence until the lights of the city appeared on the horizon.",
+    "If you lose this duel, you will leave the academy and never return.",
+    "The beast let out a deafening howl and charged straight at the young hunter.",
+    "He opened the letter with trembling fingers, afraid of what he might read.",
+    "The princess looked out of the window, wondering whether he would keep his promise.",
+    "Within a single night, the entire mountain had been reduced to ashes.",
+]
+
+def _ngrams(text: str, n: int) -> Counter:
+    """Conta os n-gramas de caracteres de um texto, sem espaços."""
+    text = ''.join(text.split())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+def chrf(hypothesis: str, reference: str, max_order: int = 6, beta: float = 2.0) -> float:
+    """Calcula o chrF (0 a 100) de uma tradução em relação a uma referência."""
+    precisions = []
+    recalls = []
+    for n in range(1, max_order + 1):
+        hyp = _ngrams(hypothesis, n)
+        ref = _ngrams(reference, n)
+        if not hyp or not ref:
+            continue
+        matches = sum((hyp & ref).values())
+        precisions.append(matches / sum(hyp.values()))
+        recalls.append(matches / sum(ref.values()))
+    if not precisions:
+        return 100.0 if hypothesis.strip() == reference.strip() else 0.0
+
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+def measure(config: Optional[Config], quantize: bool, sentences: List[str]) -> Dict:
+    """Carrega o tradutor num modo e mede memória, velocidade e as traduções da amostra."""
+    gc.collect()
+    rss_before = current_rss_mb()
+    load_start = time.perf_counter()
+    translator = Translator(
+        backend=config.config['translation_backend'] if config else 'torch',
+        models_dir=config.models_dir if config else None,
+        quantize=quantize
+    )
+    load_time = time.perf_counter() - load_start
+    rss_after = current_rss_mb()
+
+    # Aquece o modelo antes de medir (sem memória de tradução)
+    translator.generate(sentences[:1])
+    start = time.perf_counter()
+    translations = []
+    for i in range(0, len(sentences), translator.batch_size):
+        translations.extend(translator.generate(sentences[i:i + translator.batch_size]))
+    elapsed = time.perf_counter() - start
+
+    tokens = sum(len(translator.tokenizer.tokenize(sentence)) for sentence in sentences)
+    result = {
+        'mode': 'int8' if quantize else 'fp32',
+        'backend': translator.backend.name,
+        'load_seconds': round(load_time, 3),
+        'sentences_per_second': round(len(sentences) / elapsed, 3),
+        'tokens_per_second': round(tokens / elapsed, 3),
+        'model_memory_mb': round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None,
+        'translations': translations,
+    }
+    del translator
+    gc.collect()
+    return result
+
+def measure_in_subprocess(quantize: bool, sentences: List[str], use_config: bool) -> Dict:
+    """Mede um modo num processo novo, para que a memória de um modo não afete a medição do outro."""
+    command = [sys.executable, '-m', 'src.novel_pt.quality_report', '--measure', 'int8' if quantize else 'fp32']
+    if not use_config:
+        command.append('--no-config')
+    process = subprocess.run(command, input=json.dumps(sentences), capture_output=True, text=True,
+                             cwd=str(Path(__file__).parent.parent.parent))
+    for line in reversed(process.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    error = (process.stderr or process.stdout).strip().splitlines()
+    raise RuntimeError(f"Falha ao medir o modo {'int8' if quantize else 'fp32'}: "
+                       f"{error[-1] if error else f'código de saída {process.returncode}'}")
+
+def run_report(config: Optional[Config] = None, sentences: Optional[List[str]] = None) -> Dict:
+    """Compara o modelo fp32 com o quantizado em int8 na amostra fixa, cada modo num processo próprio."""
+    sentences = sentences or SAMPLE_SENTENCES
+    fp32 = measure_in_subprocess(False, sentences, config is not None)
+    int8 = measure_in_subprocess(True, sentences, config is not None)
+
+    scores = [chrf(hyp, ref) for hyp, ref in zip(int8['translations'], fp32['translations'])]
+    return {
+        'sentences': len(sentences),
+        'fp32': fp32,
+        'int8': int8,
+        'chrf_vs_fp32': round(sum(scores) / len(scores), 2),
+        'speedup': round(int8['sentences_per_second'] / fp32['sentences_per_second'], 2),
+    }
+
+def format_report(report: Dict) -> str:
+    """Formata o relatório como uma tabela curta."""
+    lines = [f"Amostra: {report['sentences']} sentenças (motor: {report['fp32']['backend']})"]
+    lines.append(f"{'Modo':<6} {'Carga (s)':>10} {'Sent/s':>10} {'Tokens/s':>10} {'Memória (MB)':>13}")
+    for mode in ('fp32', 'int8'):
+        result = report[mode]
+        memory = f"{result['model_memory_mb']:.1f}" if result['model_memory_mb'] is not None else '-'
+        lines.append(f"{mode:<6} {result['load_seconds']:>10.2f} {result['sentences_per_second']:>10.2f} "
+                     f"{result['tokens_per_second']:>10.1f} {memory:>13}")
+    lines.append(f"Aceleração int8: {report['speedup']:.2f}x")
+    lines.append(f"Qualidade int8 (chrF em relação ao fp32): {report['chrf_vs_fp32']:.1f}")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a tradução fp32 com o modo quantizado int8.")
+    parser.add_argument('--json', action='store_true', help="Imprime o relatório em JSON")
+    parser.add_argument('--measure', choices=('fp32', 'int8'), help=argparse.SUPPRESS)
+    parser.add_argument('--no-config', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Dentro do processo auxiliar: mede um único modo com as sentenças recebidas na entrada padrão
+    if args.measure:
+        sentences = json.loads(sys.stdin.read())
+        result = measure(None if args.no_config else Config(), args.measure == 'int8', sentences)
+        print(RESULT_PREFIX + json.dumps(result, ensure_ascii=False), flush=True)
+        return
+
+    report = run_report(Config())
+    if args.json:
+        print(json.dumps(report, indent=4, ensure_ascii=False))
+    else:
+        print(format_report(report))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+class RateLimiter:
+    """Limita as requisições por site com um token bucket, permitindo várias threads ao mesmo tempo."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """rate: requisições por segundo em cada site; burst: requisições seguidas permitidas."""
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, list] = {}  # site -> [tokens, instante da última atualização]
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Aguarda até que uma requisição ao site da URL seja permitida e retorna o tempo de espera."""
+        if self.rate <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, [float(self.burst), now])
+            # Repõe os tokens acumulados desde a última requisição
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            # Reserva o token; se faltar, o saldo fica negativo e a espera é proporcional
+            bucket[0] -= 1
+            wait = -bucket[0] / self.rate if bucket[0] < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+# Limitador compartilhado por todos os trabalhos, para que várias novels do mesmo site respeitem o mesmo limite
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+def get_rate_limiter(config: Optional['Config'] = None) -> RateLimiter:
+    """Retorna o limitador de requisições compartilhado, criando-o na primeira chamada."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(config.config['requests_per_second'] if config else 0.5)
+        return _shared_limiter
@@ -0,0 +1,272 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Não depende do Qt: a interface recebe as atualizações dos trabalhos por callbacks
+
+# Situações de um trabalho
+QUEUED = 'Na fila'
+RUNNING = 'Executando'
+DONE = 'Concluído'
+FAILED = 'Erro'
+CANCELLED = 'Cancelado'
+
+class TranslationGate:
+    """Divide a capacidade de tradução entre os trabalhos: a vaga livre vai para quem usou menos até agora."""
+
+    def __init__(self, capacity: int = 1):
+        self.capacity = max(1, capacity)
+        self._in_use = 0
+        self._served: Dict[str, int] = {}  # Traduções concedidas a cada trabalho
+        self._waiting: List = []  # (concedidas, chegada, trabalho)
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, job_id: str) -> None:
+        """Aguarda uma vaga de tradução para o trabalho."""
+        with self._condition:
+            # Um trabalho novo começa empatado com o que usou menos, para não tomar todas as vagas até alcançar os outros
+            if job_id not in self._served:
+                self._served[job_id] = min(self._served.values(), default=0)
+            entry = (self._served[job_id], next(self._tickets), job_id)
+            heapq.heappush(self._waiting, entry)
+            # Espera ser o primeiro da fila (o que usou menos vagas) e haver vaga livre
+            while self._in_use >= self.capacity or self._waiting[0] is not entry:
+                self._condition.wait()
+            heapq.heappop(self._waiting)
+            self._in_use += 1
+            self._served[job_id] += 1
+            self._condition.notify_all()
+
+    def release(self) -> None:
+        """Devolve uma vaga de tradução."""
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify_all()
+
+    def forget(self, job_id: str) -> None:
+        """Descarta a contagem de um trabalho encerrado."""
+        with self._condition:
+            self._served.pop(job_id, None)
+
+class Job:
+    """Trabalho de processamento de um lote de capítulos de uma novel."""
+
+    def __init__(self, job_id: str, novel_id: str, name: str, priority: int = 0):
+        self.id = job_id
+        self.novel_id = novel_id
+        self.name = name
+        self.priority = priority  # Menor valor = executado antes
+        self.status = QUEUED
+        self.progress = 0
+        self.message = ''
+        self.output_file: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'novel_id': self.novel_id,
+            'name': self.name,
+            'priority': self.priority,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'output_file': self.output_file,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+def run_chapter_job(job: Job, config: 'Config', gate: TranslationGate,
+                    progress: Callable[[int, str], None]) -> Optional[str]:
+    """Processa o próximo lote da novel do trabalho e retorna o arquivo gerado."""
+    from .chapter_manager import ChapterManager
+
+    # Lê os dados atuais da novel no banco: um trabalho anterior (ou outro processo) pode ter avançado o capítulo atual
+    novel_data = config.refresh_novel(job.novel_id)
+    if novel_data is None:
+        raise ValueError(f"Novel com ID '{job.novel_id}' não encontrada")
+    novel_data = dict(novel_data)
+
+    chapter_manager = ChapterManager(novel_data, progress, config, translation_gate=gate, job_id=job.id)
+    return chapter_manager.process_chapters(novel_data['current_chapter'], novel_data['batch_size'])
+
+class JobScheduler:
+    """Fila de trabalhos com prioridades, executando vários trabalhos ao mesmo tempo (uma novel por vez cada)."""
+
+    def __init__(self, config: Optional['Config'] = None, max_concurrent_jobs: Optional[int] = None,
+                 translation_capacity: Optional[int] = None,
+                 runner: Optional[Callable] = None):
+        self.config = config
+        if max_concurrent_jobs is None:
+            max_concurrent_jobs = config.config['max_concurrent_jobs'] if config else 1
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        if translation_capacity is None:
+            # Uma vaga por processo de tradução (o tradutor no próprio processo atende um capítulo por vez)
+            translation_capacity = config.config['translation_workers'] if config else 1
+        self.gate = TranslationGate(translation_capacity)
+        self.runner = runner or run_chapter_job
+
+        self.jobs: Dict[str, Job] = {}
+        self._queue: List = []  # (prioridade, ordem, trabalho)
+        self._order = itertools.count()
+        self._ids = itertools.count(1)
+        self._active_novels = set()
+        self._running = 0
+        self._closed = False
+        self._listeners: List[Callable[[Job], None]] = []
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+
+    def add_listener(self, callback: Callable[[Job], None]) -> None:
+        """Registra uma função chamada (em qualquer thread) a cada mudança de um trabalho."""
+        self._listeners.append(callback)
+
+    def _notify(self, job: Job) -> None:
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"⚠️ Erro ao notificar a atualização do trabalho: {str(e)}")
+
+    def submit(self, novel_data: Dict, priority: int = 0) -> Job:
+        """Coloca na fila o próximo lote de uma novel."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("O agendador de trabalhos foi encerrado")
+            job = Job(str(next(self._ids)), novel_data['id'], novel_data.get('name', ''), priority)
+            self.jobs[job.id] = job
+            heapq.heappush(self._queue, (priority, next(self._order), job))
+            self._start_threads()
+            self._condition.notify_all()
+        self._notify(job)
+        return job
+
+    def set_priority(self, job_id: str, priority: int) -> bool:
+        """Altera a prioridade de um trabalho que ainda está na fila."""
+        with self._condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job.priority = priority
+            self._queue = [(queued.priority, order, queued) for _, order, queued in self._queue]
+            heapq.heapify(self._queue)
+            self._condition.notify_all()
+        self._notify(job)
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancela um trabalho que ainda está na fila."""
+        with self._condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            self._queue = [entry for entry in self._queue if entry[2] is not job]
+            heapq.heapify(self._queue)
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        self._notify(job)
+        return True
+
+    def _start_threads(self) -> None:
+        """Inicia as threads de execução que ainda não existem."""
+        while len(self._threads) < self.max_concurrent_jobs:
+            thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads) + 1}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job(self) -> Optional[Job]:
+        """Retira da fila o trabalho de maior prioridade cuja novel não está em execução."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                for entry in sorted(self._queue, key=lambda queued: queued[:2]):
+                    job = entry[2]
+                    if job.novel_id not in self._active_novels:
+                        self._queue.remove(entry)
+                        heapq.heapify(self._queue)
+                        self._active_novels.add(job.novel_id)
+                        self._running += 1
+                        job.status = RUNNING
+                        job.started_at = time.time()
+                        return job
+                self._condition.wait()
+
+    def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._notify(job)
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        def progress(value: int, message: str) -> None:
+            # As mensagens de registro chegam com progresso 0: mantém o último valor
+            if value:
+                job.progress = value
+            job.message = message
+            self._notify(job)
+
+        try:
+            output_file = self.runner(job, self.config, self.gate, progress)
+            if output_file:
+                job.output_file = output_file
+                job.progress = 100
+                job.status = DONE
+            else:
+                job.error = job.message or "Não foi possível processar os capítulos."
+                job.status = FAILED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self.gate.forget(job.id)
+            # Notifica antes de liberar a novel, para que um novo lote agendado no aviso não seja perdido por wait()
+            self._notify(job)
+            with self._condition:
+                self._active_novels.discard(job.novel_id)
+                self._running -= 1
+                self._condition.notify_all()
+
+    def pending(self) -> int:
+        """Número de trabalhos na fila ou em execução."""
+        with self._condition:
+            return len(self._queue) + self._running
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda até que todos os trabalhos terminem; retorna False se o tempo acabar antes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self) -> None:
+        """Cancela os trabalhos na fila; os que estão em execução terminam o lote atual."""
+        with self._condition:
+            self._closed = True
+            cancelled = [entry[2] for entry in self._queue]
+            self._queue = []
+            for job in cancelled:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+            self._condition.notify_all()
+        for job in cancelled:
+            self._notify(job)
@@ -0,0 +1,122 @@
+import threading
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple
+
+# Palavras cujos tokens ficam guardados entre capítulos (nomes e termos se repetem muito)
+MAX_CACHED_WORDS = 100_000
+
+class Segment(NamedTuple):
+    """Trecho de texto enviado ao modelo, com os ids dos seus tokens (sem o token de fim)."""
+    text: str
+    token_ids: List[int]
+
+def load_sentence_tokenizer():
+    """Carrega o divisor de sentenças 'punkt' do NLTK em inglês uma única vez."""
+    import nltk
+
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+        return PunktTokenizer('english')
+    except ImportError:
+        # Versões antigas do NLTK usam o 'punkt' em pickle
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+
+class Segmenter:
+    """Divide capítulos em segmentos para tradução, tokenizando cada palavra uma única vez."""
+
+    def __init__(self, tokenizer, max_length: int, segment_tokens: int = 128):
+        self.tokenizer = tokenizer
+        # Tokens por segmento, sem ultrapassar o limite do modelo (reservando o token de fim de sequência)
+        self.max_tokens = max(1, min(segment_tokens, max_length - 1))
+        self.sentence_tokenizer = load_sentence_tokenizer()
+        self._word_ids: Dict[str, List[int]] = {}
+        self._word_ids_lock = threading.Lock()  # O tradutor compartilhado divide textos em várias threads
+
+    def word_ids(self, words: List[str]) -> Dict[str, List[int]]:
+        """Retorna os ids dos tokens de cada palavra, tokenizando só as que ainda não foram vistas."""
+        # O sentencepiece não junta tokens de palavras diferentes, então os tokens de um texto
+        # são os tokens das suas palavras em sequência
+        known = {}
+        missing = []
+        with self._word_ids_lock:
+            for word in dict.fromkeys(words):
+                ids = self._word_ids.get(word)
+                if ids is None:
+                    missing.append(word)
+                else:
+                    known[word] = ids
+        if missing:
+            # Tokeniza fora do lock; outra thread pode tokenizar a mesma palavra, com o mesmo resultado
+            tokenized = {word: self.tokenizer.convert_tokens_to_ids(self.tokenizer.tokenize(word)) for word in missing}
+            known.update(tokenized)
+            with self._word_ids_lock:
+                if len(self._word_ids) + len(tokenized) > MAX_CACHED_WORDS:
+                    self._word_ids = {}
+                self._word_ids.update(tokenized)
+        return known
+
+    def split_sentences(self, text: str) -> List[List[str]]:
+        """Divide o texto em sentenças numa única passada, agrupadas pela linha onde estão."""
+        lines = text.split('\n')
+        line_starts = []
+        position = 0
+        for line in lines:
+            line_starts.append(position)
+            position += len(line) + 1
+
+        sentences = [[] for _ in lines]
+        for start, end in self.sentence_tokenizer.span_tokenize(text):
+            # Sentenças sem pontuação no fim de uma linha continuam na seguinte: corta nas quebras de linha
+            line_index = bisect_right(line_starts, start) - 1
+            for part in text[start:end].split('\n'):
+                part = part.strip()
+                if part:
+                    sentences[line_index].append(part)
+                line_index += 1
+        return sentences
+
+    def split_text(self, text: str) -> List[List[Segment]]:
+        """Divide o texto em segmentos, linha por linha (linhas vazias ficam sem segmentos)."""
+        sentences_by_line = self.split_sentences(text)
+        ids = self.word_ids([word for sentences in sentences_by_line
+                             for sentence in sentences for word in sentence.split()])
+        return [self.split_line(sentences, ids) for sentences in sentences_by_line]
+
+    def split_line(self, sentences: List[str], ids: Dict[str, List[int]]) -> List[Segment]:
+        """Agrupa as sentenças de uma linha em segmentos de até max_tokens tokens."""
+        segments = []
+        current_group = []
+        current_ids = []
+        for sentence in sentences:
+            words = sentence.split()
+            sentence_ids = [token for word in words for token in ids[word]]
+            if current_group and len(current_ids) + len(sentence_ids) > self.max_tokens:
+                segments.append(Segment(' '.join(current_group), current_ids))
+                current_group = []
+                current_ids = []
+            if len(sentence_ids) > self.max_tokens:
+                # Sentença longa demais sozinha: divide pelas palavras
+                segments.extend(self.split_long_segment(words, ids))
+                continue
+            current_group.append(sentence)
+            current_ids.extend(sentence_ids)
+        if current_group:
+            segments.append(Segment(' '.join(current_group), current_ids))
+        return segments
+
+    def split_long_segment(self, words: List[str], ids: Dict[str, List[int]]) -> List[Segment]:
+        """Divide um trecho acima do limite de tokens numa única passada, somando os tokens de cada palavra."""
+        segments = []
+        current_words = []
+        current_ids = []
+        for word in words:
+            word_ids = ids[word]
+            if current_words and len(current_ids) + len(word_ids) > self.max_tokens:
+                segments.append(Segment(' '.join(current_words), current_ids))
+                current_words = []
+                current_ids = []
+            current_words.append(word)
+            current_ids.extend(word_ids)
+        if current_words:
+            segments.append(Segment(' '.join(current_words), current_ids))
+        return segments
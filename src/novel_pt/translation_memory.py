@@ -0,0 +1,126 @@
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class TranslationMemory:
+    """Memória de tradução persistente em SQLite, indexada por modelo e segmento de origem."""
+
+    def __init__(self, db_path: Path, model_name: str, max_entries: int = 200000, variant: str = ''):
+        """Abre (ou cria) o banco da memória de tradução para o modelo informado."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.variant = variant  # Ex.: 'int8'; cada variante tem chaves próprias no mesmo banco
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                "key TEXT PRIMARY KEY, translation TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments (last_used)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+        # Descarta as traduções de um modelo anterior; trocar apenas a variante não apaga nada
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'model_name'").fetchone()
+        if row is None or row[0] != model_name:
+            self.invalidate()
+
+    @staticmethod
+    def normalize(segment: str) -> str:
+        """Normaliza o segmento de origem (espaços) antes de gerar a chave."""
+        return ' '.join(segment.split())
+
+    def _key(self, segment: str) -> str:
+        """Gera a chave do segmento a partir do modelo e do texto normalizado."""
+        model_key = f"{self.model_name}:{self.variant}" if self.variant else self.model_name
+        raw = f"{model_key}\0{self.normalize(segment)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, segments: List[str]) -> List[Optional[str]]:
+        """Retorna as traduções conhecidas (ou None) para cada segmento."""
+        keys = [self._key(segment) for segment in segments]
+        found: Dict[str, str] = {}
+        with self._lock:
+            # Consulta em blocos para respeitar o limite de parâmetros do SQLite
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, translation FROM segments WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+
+            # Atualiza o uso das entradas encontradas (LRU)
+            if found:
+                now = time.time()
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE segments SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found]
+                    )
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for result in results if result is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(self, segments: List[str], translations: List[str]) -> None:
+        """Armazena as traduções e remove as entradas menos usadas se necessário."""
+        if not segments:
+            return
+        now = time.time()
+        rows = [(self._key(segment), translation, now) for segment, translation in zip(segments, translations)]
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO segments (key, translation, last_used) VALUES (?, ?, ?)", rows
+                )
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove as entradas menos usadas recentemente além do limite configurado."""
+        count = self.conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM segments WHERE key IN "
+                "(SELECT key FROM segments ORDER BY last_used ASC LIMIT ?)", (excess,)
+            )
+
+    def invalidate(self, model_name: Optional[str] = None) -> None:
+        """Apaga todas as traduções e associa a memória ao modelo informado."""
+        if model_name is not None:
+            self.model_name = model_name
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM segments")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('model_name', ?)", (self.model_name,)
+                )
+
+    def stats(self) -> Dict:
+        """Retorna os contadores de acertos e falhas e o tamanho atual."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': entries,
+                'max_entries': self.max_entries,
+            }
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from .translator import Translator
+from .metrics import get_metrics, current_labels
+
+# Tradutor próprio de cada processo auxiliar
+_worker_translator = None
+
+def _init_worker(options: Dict, num_threads: int) -> None:
+    """Carrega o modelo no processo auxiliar e limita as threads usadas pelo PyTorch."""
+    global _worker_translator
+    import torch
+    torch.set_num_threads(num_threads)
+    _worker_translator = Translator(**options)
+
+def _translate_in_worker(text: str) -> Tuple[str, Dict]:
+    """Traduz um texto no processo auxiliar e retorna também as métricas registradas durante a tradução."""
+    metrics = get_metrics()
+    metrics.reset()
+    return _worker_translator.translate_text(text), metrics.snapshot()
+
+class TranslationPool:
+    """Conjunto de processos, cada um com seu próprio modelo, que traduzem capítulos em paralelo."""
+
+    def __init__(self, workers: int, config: Optional['Config'] = None):
+        self.workers = workers
+        # Divide os núcleos da máquina entre os processos
+        self.num_threads = max(1, (os.cpu_count() or 1) // workers)
+        # 'spawn' evita copiar por fork as threads do Qt, do scheduler e do PyTorch do processo principal
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(Translator.options_from_config(config), self.num_threads)
+        )
+
+    def submit(self, text: str) -> Future:
+        """Agenda a tradução de um texto e retorna o Future com o resultado."""
+        # As métricas do processo auxiliar recebem as etiquetas de quem pediu a tradução
+        labels = current_labels()
+        result = Future()
+        worker_future = self.executor.submit(_translate_in_worker, text)
+
+        def done(future: Future) -> None:
+            if future.cancelled():
+                result.set_exception(CancelledError())
+                return
+            error = future.exception()
+            if error is not None:
+                result.set_exception(error)
+                return
+            translated, snapshot = future.result()
+            get_metrics().merge(snapshot, **labels)
+            result.set_result(translated)
+
+        result.set_running_or_notify_cancel()
+        worker_future.add_done_callback(done)
+        return result
+
+    def warm_up(self) -> None:
+        """Inicia os processos e carrega os modelos antes do primeiro trabalho."""
+        futures = [self.submit('') for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Encerra os processos auxiliares."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# Conjunto de processos compartilhado por todos os trabalhos do aplicativo
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def get_translation_pool(config: Optional['Config'] = None) -> Optional[TranslationPool]:
+    """Retorna o conjunto de processos compartilhado, ou None se a tradução roda no próprio processo."""
+    global _shared_pool
+    workers = config.config['translation_workers'] if config else 1
+    if workers <= 1:
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = TranslationPool(workers, config)
+        return _shared_pool
+
+def shutdown_translation_pool() -> None:
+    """Encerra o conjunto de processos compartilhado, se existir."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.shutdown()
+            _shared_pool = None
@@ -1,117 +1,204 @@
-from transformers import MarianMTModel, MarianTokenizer
-import torch
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
-from docx import Document
+import sys
+import threading
+from pathlib import Path
 from datetime import datetime
-import nltk
-
-# Garante que o 'punkt' está baixado
-nltk.download('punkt')
+from .translation_memory import TranslationMemory
+from .backends import create_backend
+from .docx_writer import DocxWriter
+from .metrics import get_metrics
+from .segmenter import Segment, Segmenter
+
+# torch, transformers e nltk são importados apenas no primeiro uso para não atrasar a abertura da janela
+
+# Dados do NLTK distribuídos com o aplicativo (pasta do pacote ou do executável do PyInstaller)
+NLTK_DATA_DIR = Path(getattr(sys, '_MEIPASS', Path(__file__).parent)) / 'nltk_data'
+
+_punkt_ready = False
+
+def ensure_punkt() -> None:
+    """Garante que o 'punkt' está disponível, baixando-o apenas se não existir localmente."""
+    global _punkt_ready
+    if _punkt_ready:
+        return
+
+    import nltk
+    if str(NLTK_DATA_DIR) not in nltk.data.path:
+        nltk.data.path.insert(0, str(NLTK_DATA_DIR))
+
+    # Versões recentes do NLTK usam o 'punkt_tab' no lugar do 'punkt'
+    resource = 'punkt_tab' if hasattr(nltk.tokenize.punkt, 'PunktTokenizer') else 'punkt'
+    try:
+        nltk.data.find(f'tokenizers/{resource}')
+    except LookupError:
+        nltk.download(resource, quiet=True)
+    _punkt_ready = True
+
+# Instância única do tradutor compartilhada por todos os trabalhos do aplicativo,
+# junto das opções com que foi criada
+_shared_translator = None
+_shared_translator_options = None
+_shared_translator_lock = threading.Lock()
+
+def get_shared_translator(config: Optional['Config'] = None) -> 'Translator':
+    """Retorna o tradutor compartilhado, carregando o modelo de novo apenas se as configurações mudaram."""
+    global _shared_translator, _shared_translator_options
+    options = Translator.options_from_config(config)
+    with _shared_translator_lock:
+        if _shared_translator is None or options != _shared_translator_options:
+            # Trabalhos em andamento continuam com o tradutor anterior até terminarem
+            _shared_translator = Translator(**options)
+            _shared_translator_options = options
+        return _shared_translator
 
 class Translator:
-    def __init__(self):
-        """Inicializa o tradutor com o modelo e tokenizer."""
+    def __init__(self, memory_path: Optional[Path] = None, backend: str = 'torch',
+                 models_dir: Optional[Path] = None, quantize: bool = False,
+                 segment_max_tokens: int = 128, batch_max_tokens: int = 2048):
+        """Inicializa o tradutor com o tokenizer, o motor de inferência e a memória de tradução opcional."""
+        from transformers import MarianTokenizer
+
+        ensure_punkt()
         self.model_name = 'Helsinki-NLP/opus-mt-tc-big-en-pt'  # Modelo para tradução de inglês para português
         self.tokenizer = MarianTokenizer.from_pretrained(self.model_name)
-        self.model = MarianMTModel.from_pretrained(self.model_name)
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model.to(self.device)
         self.max_length = self.tokenizer.model_max_length
+        self.quantize = quantize
+        self.backend = create_backend(backend, self.model_name, self.tokenizer, self.max_length, models_dir, quantize)
+        self.batch_size = 16  # Máximo de segmentos traduzidos por chamada ao modelo
+        # Tokens por lote, contando o preenchimento até o segmento mais longo
+        self.batch_max_tokens = batch_max_tokens
+        self.segmenter = Segmenter(self.tokenizer, self.max_length, segment_max_tokens)
+        # O modo int8 gera traduções ligeiramente diferentes, então usa uma memória própria
+        self.memory = TranslationMemory(memory_path, self.model_name, variant='int8' if quantize else '') if memory_path else None
+
+    @staticmethod
+    def options_from_config(config: Optional['Config'] = None) -> Dict:
+        """Retorna os argumentos do tradutor definidos nas configurações do aplicativo."""
+        if config is None:
+            return {}
+        return {
+            'memory_path': config.translation_memory_file,
+            'backend': config.config['translation_backend'],
+            'models_dir': config.models_dir,
+            'quantize': config.config['quantize'],
+            'segment_max_tokens': config.config['segment_max_tokens'],
+            'batch_max_tokens': config.config['batch_max_tokens'],
+        }
+
+    @classmethod
+    def from_config(cls, config: Optional['Config'] = None) -> 'Translator':
+        """Cria o tradutor com as opções salvas nas configurações do aplicativo."""
+        return cls(**cls.options_from_config(config))
 
     def translate_text(self, text: str) -> str:
         """Traduz um texto do inglês para português."""
-        try:
+        return self.translate_texts([text])[0]
+
+    def translate_texts(self, texts: List[str]) -> List[str]:
+        """Traduz vários textos (ex.: capítulos) compartilhando os lotes do modelo."""
+        # Para cada texto guarda, por linha, o intervalo de segmentos que a compõem
+        segments = []
+        plans = []
+        for text in texts:
             if not text or not text.strip():
-                return text
+                plans.append(None)
+                continue
 
             # Divide o texto em linhas para preservar quebras de linha
-            lines = text.split('\n')
-            translated_lines = []
-
-            for line in lines:
-                if not line.strip():
-                    translated_lines.append('')
+            try:
+                segments_by_line = self.segmenter.split_text(text)
+            except Exception as e:
+                print(f"Erro ao processar texto: {str(e)}")
+                # Em caso de erro, mantém o texto original
+                plans.append(None)
+                continue
+
+            line_plans = []
+            for line, line_segments in zip(text.split('\n'), segments_by_line):
+                if not line_segments:
+                    line_plans.append((line if line.strip() else '', None))
                     continue
-
+                line_plans.append((line, (len(segments), len(segments) + len(line_segments))))
+                segments.extend(line_segments)
+            plans.append(line_plans)
+
+        translated_segments = self.translate_segments(segments)
+
+        # Reconstrói cada texto com as quebras de linha originais
+        results = []
+        for text, line_plans in zip(texts, plans):
+            if line_plans is None:
+                results.append(text)
+                continue
+            translated_lines = []
+            for line, span in line_plans:
+                if span is None:
+                    translated_lines.append(line)
+                else:
+                    translated_lines.append(' '.join(translated_segments[span[0]:span[1]]))
+            results.append('\n'.join(translated_lines))
+        return results
+
+    def translate_segments(self, segments: List[Segment]) -> List[str]:
+        """Traduz uma lista de segmentos em lotes, preservando a ordem original."""
+        texts = [segment.text for segment in segments]
+        # Consulta a memória de tradução antes de chamar o modelo
+        if self.memory:
+            try:
+                translated = self.memory.get_many(texts)
+            except Exception as e:
+                print(f"Erro ao consultar memória de tradução: {str(e)}")
+                translated = [None] * len(segments)
+        else:
+            translated = [None] * len(segments)
+
+        # Traduz apenas os segmentos desconhecidos, sem repetições
+        pending = list({segment.text: segment for segment, result in zip(segments, translated)
+                        if result is None}.values())
+        metrics = get_metrics()
+        metrics.inc('novel_pt_translation_memory_hits_total', len(segments) - sum(1 for result in translated if result is None))
+        metrics.inc('novel_pt_sentences_translated_total', len(pending))
+        new_translations = {}
+        for batch_segments in self.make_batches(pending):
+            batch = [segment.text for segment in batch_segments]
+            try:
+                # Os tokens calculados na divisão do texto são reaproveitados pelo modelo
+                results = self.generate(batch, [segment.token_ids for segment in batch_segments])
+            except Exception as e:
+                print(f"Erro ao traduzir lote: {str(e)}")
+                # Em caso de erro, mantém o texto original
+                new_translations.update(zip(batch, batch))
+                continue
+            new_translations.update(zip(batch, results))
+            if self.memory:
                 try:
-                    # Divide a linha em sentenças
-                    sentences = nltk.tokenize.sent_tokenize(line, language='english')
-                    sentences = [sentence.strip() for sentence in sentences if sentence.strip()]
-
-                    # Inicializa variáveis para batching
-                    translated_sentences = []
-                    current_batch = []
-                    current_batch_chars = 0
-                    max_chars_per_request = 400
-
-                    # Agrupa sentenças em lotes
-                    batches = []
-                    for sentence in sentences:
-                        sentence_length = len(sentence)
-                        if current_batch_chars + sentence_length + 1 <= max_chars_per_request:
-                            current_batch.append(sentence)
-                            current_batch_chars += sentence_length + 1
-                        else:
-                            batches.append(current_batch)
-                            current_batch = [sentence]
-                            current_batch_chars = sentence_length + 1
-                    if current_batch:
-                        batches.append(current_batch)
-
-                    # Traduz cada lote
-                    for batch in batches:
-                        try:
-                            # Verifica se alguma sentença excede o comprimento máximo
-                            tokens = self.tokenizer.tokenize(' '.join(batch))
-                            if len(tokens) > self.max_length:
-                                # Divide em segmentos menores
-                                segments = self.split_long_sentence(' '.join(batch))
-                                for segment in segments:
-                                    encoded = self.tokenizer(segment, return_tensors="pt", padding=True, truncation=True, max_length=self.max_length).to(self.device)
-                                    translated_tokens = self.model.generate(**encoded)
-                                    translated_segment = self.tokenizer.decode(translated_tokens[0], skip_special_tokens=True, clean_up_tokenization_spaces=True)
-                                    translated_sentences.append(translated_segment)
-                            else:
-                                # Traduz o lote inteiro
-                                encoded = self.tokenizer(' '.join(batch), return_tensors="pt", padding=True, truncation=True, max_length=self.max_length).to(self.device)
-                                translated_tokens = self.model.generate(**encoded)
-                                translated = self.tokenizer.decode(translated_tokens[0], skip_special_tokens=True, clean_up_tokenization_spaces=True)
-                                translated_sentences.append(translated)
-                        except Exception as e:
-                            print(f"Erro ao traduzir lote: {str(e)}")
-                            # Em caso de erro, mantém o texto original
-                            translated_sentences.append(' '.join(batch))
-
-                    # Reconstrói a linha com as sentenças traduzidas
-                    translated_line = ' '.join(translated_sentences)
-                    translated_lines.append(translated_line)
-
+                    self.memory.put_many(batch, results)
                 except Exception as e:
-                    print(f"Erro ao processar linha: {str(e)}")
-                    # Em caso de erro, mantém a linha original
-                    translated_lines.append(line)
-
-            # Reconstrói o texto com as quebras de linha originais
-            return '\n'.join(translated_lines)
-        except Exception as e:
-            print(f"Erro na tradução: {str(e)}")
-            return text
-
-    def split_long_sentence(self, sentence: str) -> List[str]:
-        """Divide uma sentença longa em segmentos menores."""
-        words = sentence.split()
-        segments = []
-        current_segment = ''
-        for word in words:
-            if len(self.tokenizer.tokenize(current_segment + ' ' + word)) <= self.max_length:
-                current_segment += ' ' + word if current_segment else word
-            else:
-                segments.append(current_segment)
-                current_segment = word
-        if current_segment:
-            segments.append(current_segment)
-        return segments
+                    print(f"Erro ao salvar na memória de tradução: {str(e)}")
+
+        return [result if result is not None else new_translations[text]
+                for text, result in zip(texts, translated)]
+
+    def make_batches(self, segments: List[Segment]) -> List[List[Segment]]:
+        """Agrupa os segmentos em lotes de comprimentos parecidos, para desperdiçar pouco com o preenchimento."""
+        # Do mais longo para o mais curto: o primeiro segmento de cada lote define a largura do lote
+        ordered = sorted(segments, key=lambda segment: len(segment.token_ids), reverse=True)
+        batches = []
+        batch = []
+        for segment in ordered:
+            width = len(batch[0].token_ids) + 1 if batch else 0
+            if batch and (len(batch) >= self.batch_size or (len(batch) + 1) * width > self.batch_max_tokens):
+                batches.append(batch)
+                batch = []
+            batch.append(segment)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def generate(self, batch: List[str], token_ids: Optional[List[List[int]]] = None) -> List[str]:
+        """Executa o motor de inferência sobre um lote de segmentos (opcionalmente já tokenizados)."""
+        return self.backend.generate(batch, token_ids)
 
     def save_chapter(self, content: str, novel_name: str, chapter_number: int,
                     output_dir: str, format: str = "DOCX") -> str:
@@ -126,10 +213,9 @@ class Translator:
                 filename = f"{novel_name}_capitulo_{chapter_number}_{timestamp}.docx"
                 filepath = os.path.join(output_dir, filename)
 
-                # Cria o documento
-                doc = Document()
-                doc.add_paragraph(content)
-                doc.save(filepath)
+                # Cria o documento, um parágrafo por linha
+                with DocxWriter(Path(filepath)) as doc:
+                    doc.add_text(content)
             elif format == "TXT":
                 filename = f"{novel_name}_capitulo_{chapter_number}_{timestamp}.txt"
                 filepath = os.path.join(output_dir, filename)
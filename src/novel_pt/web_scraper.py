@@ -1,76 +1,284 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Tuple
+import re
 import time
-import random
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import threading
+from urllib.parse import urljoin, urlparse
+from .rate_limiter import RateLimiter
+from .browser_pool import BrowserPool, get_browser_pool
+from .page_cache import PageCache
+from .metrics import get_metrics
+
+# selenium, requests, lxml e bs4 são importados apenas no primeiro uso para não atrasar a abertura da janela
+
+# Identificação enviada nas requisições HTTP simples
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+)
+
+# Atributos que costumam guardar o destino de botões de navegação
+LINK_ATTRIBUTES = ('href', 'data-href', 'data-url', 'data-link', 'data-next')
+
+# Destinos em onclick, ex.: location.href='/cap-2' ou window.open("/cap-2")
+ONCLICK_URL_PATTERN = re.compile(
+    r"""(?:location(?:\.href)?\s*=|location\.(?:assign|replace)\(|window\.open\()\s*['"]([^'"]+)['"]"""
+)
+
+# Sites cujo link de próximo capítulo já foi lido do HTML estático, compartilhado entre os trabalhos:
+# nesses sites, a falta do link indica o último capítulo publicado, e não navegação por JavaScript
+_static_next_hosts = set()
+
+def is_disabled(get_attribute: Callable[[str], Optional[str]]) -> bool:
+    """Indica se o elemento está marcado como desativado (ex.: botão de próximo no último capítulo)."""
+    if get_attribute('disabled') is not None or (get_attribute('aria-disabled') or '').lower() == 'true':
+        return True
+    return 'disabled' in (get_attribute('class') or '').lower().split()
+
+def link_target(get_attribute: Callable[[str], Optional[str]]) -> Optional[str]:
+    """Lê o destino de um link pelo href, atributos data-* ou onclick do elemento."""
+    for attribute in LINK_ATTRIBUTES:
+        value = get_attribute(attribute)
+        if value and value.strip() and not value.strip().startswith(('#', 'javascript:')):
+            return value.strip()
+
+    onclick = get_attribute('onclick')
+    if onclick:
+        match = ONCLICK_URL_PATTERN.search(onclick)
+        if match:
+            return match.group(1)
+    return None
 
 class WebScraper:
-    def __init__(self):
-        """Inicializa o WebScraper com o driver do Chrome."""
-        options = Options()
-        options.add_argument('--headless')  # Executa em modo headless
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--disable-notifications')
-        options.add_argument('--disable-popup-blocking')
-        options.add_argument('--start-maximized')
-
-        # Configura o driver usando webdriver_manager
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(
-            options=options,
-            service=service
-        )
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, browser_pool: Optional[BrowserPool] = None,
+                 page_cache: Optional[PageCache] = None, metric_labels: Optional[Dict[str, str]] = None):
+        """Inicializa o WebScraper com uma sessão HTTP; o Chrome só é usado quando um site precisar dele."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Sessão com conexões reaproveitadas (keep-alive)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = USER_AGENT
+
+        # Intervalo entre requisições ao mesmo site para evitar bloqueios (em média uma a cada 2s)
+        self.rate_limiter = rate_limiter or RateLimiter(0.5)
+
+        # Os navegadores vêm de um conjunto compartilhado e são reaproveitados entre os trabalhos
+        self.browser_pool = browser_pool or get_browser_pool()
+        self.driver = None
+        self.wait = None
+        self.browser_hosts = set()  # Sites cujo conteúdo só aparece no navegador
+        self._browser_lock = threading.RLock()  # O navegador atende uma página por vez
+
+        # Páginas e textos já baixados (opcional)
+        self.page_cache = page_cache
+
+        # Etiquetas (ex.: novel_id) das métricas registradas por este scraper, em qualquer thread
+        self.metrics = get_metrics()
+        self.metric_labels = dict(metric_labels or {})
+
+        # Página atual: a árvore do lxml quando veio por HTTP simples, None quando veio do navegador
+        self.current_url = None
+        self.current_tree = None
+        self.current_from_cache = False
+
+    def _start_driver(self):
+        """Obtém um navegador do conjunto compartilhado na primeira vez que ele é necessário."""
+        if self.driver is not None:
+            return
+
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver = self.browser_pool.acquire()
         self.wait = WebDriverWait(self.driver, 10)  # Timeout de 10 segundos
 
-    def __del__(self):
-        """Fecha o driver quando o objeto é destruído."""
-        if hasattr(self, 'driver'):
+    def release_driver(self):
+        """Devolve o navegador ao conjunto compartilhado; um novo é obtido se voltar a ser necessário."""
+        lock = getattr(self, '_browser_lock', None)
+        if lock is None:
+            return
+        with lock:
+            driver, self.driver, self.wait = self.driver, None, None
+            if driver is None:
+                return
+            # A página atual estava no navegador devolvido
+            if self.current_tree is None:
+                self.current_url = None
             try:
-                self.driver.quit()
-            except:
+                self.browser_pool.release(driver)
+            except Exception:
                 pass
 
-    def get_page(self, url: str) -> Optional[str]:
-        """Obtém o conteúdo HTML de uma página."""
+    def close(self):
+        """Devolve o navegador ao conjunto compartilhado e fecha a sessão HTTP."""
+        self.release_driver()
+        if hasattr(self, 'session'):
+            self.session.close()
+
+    def __del__(self):
+        """Devolve o navegador quando o objeto é destruído."""
         try:
-            # Adiciona um delay aleatório para evitar bloqueios
-            time.sleep(random.uniform(1, 3))
-            self.driver.get(url)
-            # Espera até que o body esteja presente
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            return self.driver.page_source
+            self.close()
+        except:
+            pass
+
+    def get_page(self, url: str, revalidate: bool = False) -> Optional[str]:
+        """Obtém o conteúdo HTML de uma página, usando o cache e o navegador apenas quando necessário."""
+        # Página em cache e dentro do prazo: não acessa o site
+        if self.page_cache and not revalidate:
+            entry = self.page_cache.get_fresh(url)
+            if entry:
+                try:
+                    self.current_tree = self._parse_html(entry['html'])
+                    self.current_url = url
+                    self.current_from_cache = True
+                    self.metrics.inc('novel_pt_page_cache_hits_total', **self.metric_labels)
+                    return entry['html']
+                except Exception as e:
+                    print(f"⚠️ Erro ao ler a página em cache, baixando novamente: {str(e)}")
+            self.metrics.inc('novel_pt_page_cache_misses_total', **self.metric_labels)
+
+        # Respeita o limite de requisições do site
+        self.rate_limiter.acquire(url)
+        self.current_from_cache = False
+
+        if urlparse(url).netloc not in self.browser_hosts:
+            page = self._fetch_static(url)
+            if page:
+                html, self.current_tree = page
+                self.current_url = url
+                return html
+            # A tentativa por HTTP já usou o token: o navegador faz uma nova requisição
+            self.rate_limiter.acquire(url)
+        return self._fetch_browser(url)
+
+    @staticmethod
+    def _parse_html(html: str):
+        """Converte o HTML numa árvore do lxml."""
+        import lxml.html
+
+        try:
+            return lxml.html.fromstring(html)
+        except ValueError:
+            # Documentos com declaração de encoding precisam ser lidos como bytes
+            return lxml.html.fromstring(html.encode('utf-8'))
+
+    def _fetch_static(self, url: str) -> Optional[Tuple[str, object]]:
+        """Obtém a página com uma requisição HTTP simples (condicional se houver cache) e retorna o HTML e sua árvore."""
+        entry = self.page_cache.get(url) if self.page_cache else None
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=15, headers=headers)
+            if response.status_code == 304 and entry:
+                # A página não mudou: renova o cache sem baixar novamente
+                self.page_cache.revalidated(url, entry)
+                self.metrics.inc('novel_pt_page_revalidations_total', **self.metric_labels)
+                self.metrics.observe('novel_pt_page_fetch_seconds', time.perf_counter() - start,
+                                     source='http', **self.metric_labels)
+                return entry['html'], self._parse_html(entry['html'])
+
+            response.raise_for_status()
+            if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                return None
+            # Sem charset no cabeçalho, o requests assume ISO-8859-1
+            if 'charset' not in response.headers.get('Content-Type', '').lower():
+                response.encoding = response.apparent_encoding
+            html = response.text
+            tree = self._parse_html(html)
+        except Exception as e:
+            print(f"Erro ao acessar {url} por HTTP: {str(e)}")
+            return None
+        self.metrics.observe('novel_pt_page_fetch_seconds', time.perf_counter() - start,
+                             source='http', **self.metric_labels)
+
+        if self.page_cache:
+            self.page_cache.put(url, html, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return html, tree
+
+    def _fetch_browser(self, url: str) -> Optional[str]:
+        """Obtém a página com o Chrome headless."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
+        try:
+            self._start_driver()
+            with self.metrics.timer('novel_pt_page_fetch_seconds', source='browser', **self.metric_labels):
+                self.driver.get(url)
+                # Espera até que o body esteja presente
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            self.current_url = url
+            self.current_tree = None
+            self.current_from_cache = False
+            html = self.driver.page_source
+            if self.page_cache:
+                self.page_cache.put(url, html)
+            return html
         except Exception as e:
             print(f"Erro ao acessar {url}: {str(e)}")
             return None
 
+    def _escalate_to_browser(self) -> bool:
+        """Marca o site atual como dependente do navegador e recarrega a página nele."""
+        host = urlparse(self.current_url).netloc
+        print(f"⚠️ Conteúdo não encontrado no HTML estático de {host}, usando o navegador")
+        self.browser_hosts.add(host)
+        self.rate_limiter.acquire(self.current_url)
+        return self._fetch_browser(self.current_url) is not None
+
+    @staticmethod
+    def _element_text(element_html: str) -> str:
+        """Extrai o texto de um trecho de HTML, ignorando scripts e estilos."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(element_html, 'html.parser')
+
+        # Remove scripts e estilos
+        for script in soup(["script", "style"]):
+            script.decompose()
+        return soup.get_text(separator='\n', strip=True)
+
     def extract_text(self, html: str, xpath: str) -> Optional[str]:
         """Extrai texto de um elemento usando XPath."""
+        # Texto já extraído desta página numa execução anterior
+        if self.page_cache and self.current_url:
+            text = self.page_cache.get_text(self.current_url, xpath)
+            if text:
+                return text
+
+        # Página obtida por HTTP simples: avalia o XPath com o lxml
+        if self.current_tree is not None:
+            with self.metrics.timer('novel_pt_extraction_seconds', **self.metric_labels):
+                text = self._extract_static_text(xpath)
+            if text:
+                if self.page_cache:
+                    self.page_cache.put_text(self.current_url, xpath, text)
+                return text
+            if not self._escalate_to_browser():
+                return None
+
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import NoSuchElementException
+
         try:
-            # Converte o HTML para uma árvore XML para usar XPath
             element = self.driver.find_element(By.XPATH, xpath)
             if not element:
                 return None
 
             # Obtém o HTML do elemento e usa BeautifulSoup para extrair o texto
-            element_html = element.get_attribute('outerHTML')
-            soup = BeautifulSoup(element_html, 'html.parser')
-
-            # Remove scripts e estilos
-            for script in soup(["script", "style"]):
-                script.decompose()
-            return soup.get_text(separator='\n', strip=True)
+            with self.metrics.timer('novel_pt_extraction_seconds', **self.metric_labels):
+                text = self._element_text(element.get_attribute('outerHTML'))
+            if text and self.page_cache:
+                self.page_cache.put_text(self.current_url, xpath, text)
+            return text
         except NoSuchElementException:
             print(f"Elemento não encontrado: {xpath}")
             return None
@@ -78,14 +286,69 @@ class WebScraper:
             print(f"Erro ao extrair texto: {str(e)}")
             return None
 
+    def _extract_static_text(self, xpath: str, tree=None) -> Optional[str]:
+        """Extrai o texto do primeiro elemento do XPath na árvore do lxml."""
+        import lxml.html
+
+        results = self._static_xpath(xpath, tree)
+        if not results:
+            return None
+
+        result = results[0]
+        if isinstance(result, str):
+            return result.strip() or None
+        return self._element_text(lxml.html.tostring(result, encoding='unicode')) or None
+
     def find_next_chapter_url(self, next_chapter_xpath: str) -> Optional[str]:
         """Encontra a URL do próximo capítulo usando XPath e interagindo com o botão."""
+        # A versão em cache pode ser anterior à publicação do próximo capítulo
+        if self.current_tree is not None and self.current_from_cache and not self._static_xpath(next_chapter_xpath):
+            if self.get_page(self.current_url, revalidate=True) is None:
+                return None
+
+        # Página obtida por HTTP simples: lê o link direto do HTML
+        if self.current_tree is not None:
+            host = urlparse(self.current_url).netloc
+            results = self._static_xpath(next_chapter_xpath)
+            next_url = self._static_link_url(results[0]) if results else None
+            if next_url:
+                _static_next_hosts.add(host)
+                return next_url
+            if results and not isinstance(results[0], str) and is_disabled(results[0].get):
+                return None  # Botão desativado: não há próximo capítulo
+            if not results and host in _static_next_hosts:
+                return None  # Último capítulo publicado de um site com links no HTML
+            # Botão sem destino (apenas JavaScript) ou site que nunca teve o link no HTML: procura no navegador,
+            # que passa a ser usado para as próximas páginas do site
+            if not self._escalate_to_browser():
+                return None
+
+        from selenium.webdriver.common.by import By
+
         try:
             # Encontra o botão usando XPath
             next_button = self.driver.find_element(By.XPATH, next_chapter_xpath)
             if not next_button:
                 return None
 
+            # Lê o destino direto do elemento ou do link que o envolve
+            current_url = self.driver.current_url
+            for element in [next_button] + next_button.find_elements(By.XPATH, './ancestor::a[@href][1] | .//a[@href]'):
+                target = link_target(element.get_dom_attribute)
+                if target:
+                    next_url = urljoin(current_url, target)
+                    return next_url if next_url != current_url else None
+
+            # Botão apenas em JavaScript: clica e volta
+            return self._click_next_button(next_button)
+
+        except Exception as e:
+            print(f"Erro ao encontrar URL do próximo capítulo: {str(e)}")
+            return None
+
+    def _click_next_button(self, next_button) -> Optional[str]:
+        """Descobre a URL do próximo capítulo clicando no botão e voltando à página atual."""
+        try:
             # Obtém a URL atual antes de clicar
             current_url = self.driver.current_url
 
@@ -93,7 +356,8 @@ class WebScraper:
             self.driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
             time.sleep(1)  # Pequeno delay para garantir que o botão esteja visível
 
-            # Clica no botão
+            # Clica no botão (o clique e a volta carregam páginas do site)
+            self.rate_limiter.acquire(current_url)
             next_button.click()
 
             # Espera a navegação completar
@@ -103,6 +367,7 @@ class WebScraper:
             next_url = self.driver.current_url
 
             # Volta para a página anterior
+            self.rate_limiter.acquire(current_url)
             self.driver.back()
 
             # Espera a navegação voltar completar
@@ -118,6 +383,100 @@ class WebScraper:
             print(f"Erro ao encontrar URL do próximo capítulo: {str(e)}")
             return None
 
+    def _static_xpath(self, xpath: str, tree=None) -> List:
+        """Avalia um XPath na árvore do lxml informada ou na da página atual."""
+        try:
+            return (self.current_tree if tree is None else tree).xpath(xpath)
+        except Exception as e:
+            print(f"Erro ao avaliar XPath {xpath}: {str(e)}")
+            return []
+
+    def _static_link_url(self, result, base_url: Optional[str] = None) -> Optional[str]:
+        """Resolve o destino de um resultado do XPath em relação à página atual (ou a base_url)."""
+        base_url = base_url or self.current_url
+        if isinstance(result, str):
+            target = result.strip() or None
+        else:
+            # Verifica o próprio elemento e o link que o envolve ou que ele contém
+            target = None
+            for element in [result] + result.xpath('./ancestor::a[@href][1] | .//a[@href]'):
+                target = link_target(element.get)
+                if target:
+                    break
+        if not target:
+            return None
+        next_url = urljoin(base_url, target)
+        return next_url if next_url != base_url else None
+
+    def fetch_chapter_text(self, url: str, content_xpath: str) -> Optional[str]:
+        """Obtém o texto de um capítulo sem alterar a página atual; pode ser chamado por várias threads."""
+        # Texto ou página já em cache
+        if self.page_cache:
+            text = self.page_cache.get_text(url, content_xpath)
+            if text:
+                self.metrics.inc('novel_pt_page_cache_hits_total', **self.metric_labels)
+                return text
+            entry = self.page_cache.get_fresh(url)
+            page = (entry['html'], self._parse_html(entry['html'])) if entry else None
+            self.metrics.inc('novel_pt_page_cache_hits_total' if page else 'novel_pt_page_cache_misses_total',
+                             **self.metric_labels)
+        else:
+            page = None
+
+        if page is None and urlparse(url).netloc not in self.browser_hosts:
+            self.rate_limiter.acquire(url)
+            page = self._fetch_static(url)
+        if page:
+            with self.metrics.timer('novel_pt_extraction_seconds', **self.metric_labels):
+                text = self._extract_static_text(content_xpath, page[1])
+            if text:
+                if self.page_cache:
+                    self.page_cache.put_text(url, content_xpath, text)
+                return text
+
+        # Sem conteúdo no HTML estático: usa o navegador, uma página por vez
+        with self._browser_lock:
+            self.browser_hosts.add(urlparse(url).netloc)
+            saved_page = (self.current_url, self.current_tree, self.current_from_cache)
+            try:
+                self.rate_limiter.acquire(url)
+                html = self._fetch_browser(url)
+                return self.extract_text(html, content_xpath) if html else None
+            finally:
+                # Restaura a página atual, que find_next_chapter_url ainda pode consultar
+                self.current_url, self.current_tree, self.current_from_cache = saved_page
+                if self.current_url and self.current_tree is None and self.current_url != url:
+                    # A página atual estava no navegador: volta a ela
+                    self.rate_limiter.acquire(self.current_url)
+                    self._fetch_browser(self.current_url)
+
+    def get_chapter_urls(self, index_url: str, index_xpath: str) -> List[str]:
+        """Lê a página de índice da novel e retorna as URLs dos capítulos na ordem em que aparecem."""
+        # O índice muda a cada capítulo publicado, então é sempre revalidado
+        html = self.get_page(index_url, revalidate=True)
+        if not html:
+            return []
+
+        urls = []
+        if self.current_tree is not None:
+            for result in self._static_xpath(index_xpath):
+                url = self._static_link_url(result, index_url)
+                if url:
+                    urls.append(url)
+        else:
+            from selenium.webdriver.common.by import By
+
+            try:
+                for element in self.driver.find_elements(By.XPATH, index_xpath):
+                    target = link_target(element.get_dom_attribute)
+                    if target:
+                        urls.append(urljoin(index_url, target))
+            except Exception as e:
+                print(f"Erro ao ler o índice: {str(e)}")
+
+        # Remove repetições (ex.: links no topo e no fim da lista) mantendo a ordem
+        return list(dict.fromkeys(urls))
+
     def get_chapter_content(self, url: str, content_xpath: str, next_chapter_xpath: str) -> Dict:
         """Obtém o conteúdo do capítulo e a URL do próximo capítulo."""
         try: